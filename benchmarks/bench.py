@@ -0,0 +1,230 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import numpy as np
+
+# Benchmarks for the history reader, indicator, payoff, chart and report code
+# on synthetic closes (1k/100k/10M bars) and the bundled Sim Data.
+#   python -m benchmarks.bench                      run and print
+#   python -m benchmarks.bench --save baseline      store as results/baseline.json
+#   python -m benchmarks.bench --compare baseline   compare, exit 1 on slowdowns
+# Each case is timed until --min-time has passed (at least --repeat runs);
+# the minimum is compared, the median is reported alongside. Baselines are
+# machine specific, so results/ is not committed: save one on the machine
+# you compare on.
+results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+sizes = {"1k": 1_000, "100k": 100_000, "10M": 10_000_000}
+# read_json_history reads an FMP-style JSON body; 10M rows is ~400 MB of text
+row_sizes = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+
+# --- Data ---
+def synthetic_closes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+
+def synthetic_body(n):
+    # An FMP historical-price-full response with n rows
+    closes = synthetic_closes(n)
+    dates = np.datetime64("1990-01-01") + np.arange(n) % 20000
+    rows = [{"date": str(d), "close": float(c)} for d, c in zip(dates, closes)]
+    return json.dumps({"symbol": "SYN", "historical": rows}).encode()
+
+def sim_data():
+    from trading import price_store
+    with open(price_store.sim_data_path, "r", encoding="utf-8", errors="ignore") as f:
+        entries = {e["symbol"]: e for e in json.load(f)}
+    stock, hedge = entries["AAPL"], entries["TSLA"]
+    rows = sorted(stock["historical"], key=lambda d: d["date"])
+    hedge_rows = sorted(hedge["historical"], key=lambda d: d["date"])
+    return {
+        "rows": rows,
+        "dates": np.array([d["date"] for d in rows], dtype="datetime64[D]"),
+        "closes": np.array([d["close"] for d in rows]),
+        "hedge_dates": np.array([d["date"] for d in hedge_rows], dtype="datetime64[D]"),
+        "hedge_closes": np.array([d["close"] for d in hedge_rows]),
+        "stock_name": stock["companyName"],
+        "hedge_name": hedge["companyName"],
+    }
+
+sim_trade = {
+    "stock_symbol": "AAPL", "hedge_symbol": "TSLA", "short_call": 216.0, "long_call": 220.0, "premium": 2.5,
+    "hedge_put_price": 250.0, "expiration": "28/06/25", "target_price": 215.0, "stock_beta": "1.20",
+    "hedge_beta": "2.30", "mc_paths": 20_000,
+}
+
+# --- Cases ---
+# name -> (sizes, setup(n) -> args, run(*args)); n is None for Sim Data
+def _read_json_setup(n):
+    if n is None:
+        return (json.dumps({"symbol": "AAPL", "historical": sim_data()["rows"]}).encode(),)
+    return (synthetic_body(n),)
+
+def _read_json(body):
+    from trading.ingest import read_json_history
+    read_json_history(io.BytesIO(body))
+
+def _closes_setup(n):
+    return (sim_data()["closes"] if n is None else synthetic_closes(n),)
+
+def _bollinger(closes):
+    from trading.indicators import bollinger_bands
+    bollinger_bands(closes, 20, 2.0)
+
+def _macd(closes):
+    from trading.indicators import macd, crossovers
+    line, signal, _ = macd(closes, 12, 26, 9)
+    crossovers(line, signal)
+
+def _pl_grid_setup(n):
+    from trading.payoff import bear_call_spread
+    legs = bear_call_spread(216.0, 220.0, 2.5)
+    prices = np.linspace(150.0, 280.0, 500 if n is None else n)
+    return legs, prices
+
+def _pl_grid(legs, prices):
+    from trading.payoff import expiry_pnl, summary
+    expiry_pnl(legs, prices)
+    summary(legs)
+
+def _chart_setup(n):
+    from trading.report import price_trade, trade_defaults
+    sim = sim_data()
+    trade = dict(trade_defaults, **sim_trade, stock_name=sim["stock_name"], hedge_name=sim["hedge_name"])
+    trade = price_trade(trade, sim["dates"], sim["closes"], sim["hedge_dates"], sim["hedge_closes"])
+    return trade, sim
+
+def _charts(fmt):
+    def run(trade, sim):
+        from trading.charts import create_pl_chart, create_hedge_chart, create_bollinger_chart, create_macd_chart
+        create_pl_chart(trade, fmt=fmt)
+        create_hedge_chart(sim["hedge_dates"], sim["hedge_closes"], trade, fmt=fmt)
+        create_bollinger_chart(sim["dates"], sim["closes"], trade, fmt=fmt)
+        create_macd_chart(sim["dates"], sim["closes"], trade, fmt=fmt)
+    return run
+
+def _pdf_setup(n):
+    sim = sim_data()
+    trade = dict(sim_trade, stock_name=sim["stock_name"], hedge_name=sim["hedge_name"])
+    return trade, sim
+
+def _generate_pdf(trade, sim):
+    # Rendered into memory (as the report server does), so runs leave no files
+    from trading.report import generate_pdf
+    generate_pdf(trade, sim["dates"], sim["closes"], sim["hedge_dates"], sim["hedge_closes"], io.BytesIO(),
+                 chart_workers=1)
+
+cases = {
+    "read_json": (row_sizes, _read_json_setup, _read_json),
+    "bollinger": (sizes, _closes_setup, _bollinger),
+    "macd": (sizes, _closes_setup, _macd),
+    "pl_grid": (sizes, _pl_grid_setup, _pl_grid),
+    "charts_vector": ({}, _chart_setup, _charts("vector")),
+    "charts_png": ({}, _chart_setup, _charts("png")),
+    "generate_pdf": ({}, _pdf_setup, _generate_pdf),
+}
+
+# --- Running ---
+def time_case(run, args, repeat=3, min_time=0.5):
+    run(*args)  # warm-up: imports, chart templates
+    times = []
+    started = time.perf_counter()
+    while len(times) < repeat or (time.perf_counter() - started < min_time and len(times) < 1000):
+        t = time.perf_counter()
+        run(*args)
+        times.append(time.perf_counter() - t)
+    times.sort()
+    return {"min": times[0], "median": times[len(times) // 2], "runs": len(times)}
+
+def run_cases(selected=None, size_labels=None, repeat=3, min_time=0.5):
+    out = {}
+    for name, (case_sizes, setup, run) in cases.items():
+        if selected and name not in selected:
+            continue
+        labels = [(label, n) for label, n in case_sizes.items() if not size_labels or label in size_labels]
+        labels.append(("sim", None))
+        for label, n in labels:
+            key = f"{name}[{label}]"
+            args = setup(n)
+            out[key] = time_case(run, args, repeat, min_time)
+            print(f"{key:28} {format_seconds(out[key]['min']):>10} min {format_seconds(out[key]['median']):>10} median"
+                  f"  ({out[key]['runs']} runs)", flush=True)
+            del args
+    return out
+
+def format_seconds(t):
+    if t < 1e-3:
+        return f"{t * 1e6:.1f}us"
+    if t < 1:
+        return f"{t * 1e3:.2f}ms"
+    return f"{t:.3f}s"
+
+def machine():
+    return {"python": sys.version.split()[0], "numpy": np.__version__, "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(), "cpus": os.cpu_count()}
+
+def result_path(name):
+    return name if name.endswith(".json") else os.path.join(results_dir, name + ".json")
+
+def save(name, results):
+    path = result_path(name)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "machine": machine(), "results": results}, f, indent=1)
+    return path
+
+def compare(baseline, results, threshold=0.2):
+    # Ratio of minimums per case; returns the report lines and the slowdowns
+    lines = [f"{'case':28} {'baseline':>10} {'current':>10} {'ratio':>7}"]
+    slower = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            lines.append(f"{key:28} {'-':>10} {format_seconds(current['min']):>10}")
+            continue
+        ratio = current["min"] / base["min"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  SLOWER"
+            slower.append(key)
+        elif ratio < 1 / (1 + threshold):
+            flag = "  faster"
+        lines.append(f"{key:28} {format_seconds(base['min']):>10} {format_seconds(current['min']):>10} {ratio:6.2f}x{flag}")
+    return lines, slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench", description="Trading benchmarks")
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default: all): {', '.join(cases)}")
+    parser.add_argument("--sizes", nargs="+", help="size labels to run, e.g. 1k 100k (Sim Data always runs)")
+    parser.add_argument("--repeat", type=int, default=3, help="minimum runs per case")
+    parser.add_argument("--min-time", type=float, default=0.5, help="minimum seconds per case")
+    parser.add_argument("--save", metavar="NAME", help="store the results as results/NAME.json (or a .json path)")
+    parser.add_argument("--compare", metavar="NAME", help="compare against stored results")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown that fails --compare")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.cases if name not in cases]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+    baseline = None
+    if args.compare:
+        with open(result_path(args.compare), "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print(" ".join(f"{k} {v}" for k, v in machine().items()))
+    results = run_cases(args.cases, args.sizes, args.repeat, args.min_time)
+    if args.save:
+        print(f"Saved {save(args.save, results)}")
+    if baseline is not None:
+        if baseline["machine"] != machine():
+            print(f"Note: baseline recorded on {baseline['machine']}")
+        lines, slower = compare(baseline["results"], results, args.threshold)
+        print("\n".join(lines))
+        if slower:
+            print(f"{len(slower)} cases more than {args.threshold:.0%} slower than {args.compare}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,24 @@
+import os
+import sys
+
+# The tests import the trading package from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+@pytest.fixture
+def feed(tmp_path, monkeypatch):
+    # The fake FMP/Yahoo feed serving Sim Data, with the loaders pointed at
+    # it and the price store and cache in tmp_path
+    from trading import data, fake_feed, fetch, price_store
+    from trading.cache import cache
+    for name in ("fmp_base", "yahoo_base", "stooq_base", "yahoo_download_base", "live_sources"):
+        monkeypatch.setattr(data, name, getattr(data, name))
+    monkeypatch.setattr(price_store, "store_dir", str(tmp_path / "store"))
+    monkeypatch.setattr(cache, "root", str(tmp_path / "cache"))
+    server, base_url = fake_feed.start()
+    fake_feed.use_feed(base_url)
+    yield server, base_url
+    fetch.pool.close()
+    server.shutdown()
+    server.server_close()
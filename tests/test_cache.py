@@ -0,0 +1,44 @@
+import os
+import threading
+from trading.cache import DiskCache
+
+# Disk cache lookups from several threads, and entries that are damaged on disk
+
+def test_corrupt_entries_are_misses(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put(("fmp", "AAPL", "profile"), b"payload")
+    assert cache.get(("fmp", "AAPL", "profile")) == b"payload"
+    path = cache.path(("fmp", "AAPL", "profile"))
+    for damaged in (b"{not json\npayload", b'{"key": []}\npayload', b"no header line"):
+        with open(path, "wb") as f:
+            f.write(damaged)
+        assert cache.get(("fmp", "AAPL", "profile")) is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 3
+
+def test_concurrent_puts_gets_and_evictions(tmp_path):
+    # A cache small enough that most puts evict while other threads read
+    cache = DiskCache(str(tmp_path), max_bytes=4096)
+    keys = [("fmp", f"S{i}", "profile") for i in range(20)]
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(200):
+                key = keys[(n + i) % len(keys)]
+                if i % 3:
+                    cache.get(key)
+                else:
+                    cache.put(key, os.urandom(512))
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    stats = cache.stats
+    assert stats["hits"] + stats["misses"] + stats["stale"] == 8 * 133
+    assert stats["stores"] == 8 * 67
+    assert cache.size() <= cache.max_bytes
+    assert not [name for _, _, names in os.walk(str(tmp_path)) for name in names if name.endswith(".tmp")]
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+from trading import charts
+from trading.report import trade_defaults
+
+# Chart input checks
+
+def test_macd_chart_needs_the_configured_warm_up():
+    dates = np.datetime64("2024-01-01") + np.arange(200)
+    prices = np.linspace(100.0, 120.0, 200)
+    trade = dict(trade_defaults, stock_name="Test", short_call=125.0, long_call=130.0, macd_fast=12, macd_slow=230,
+                 macd_signal=9)
+    with pytest.raises(ValueError, match="Not enough data for MACD"):
+        charts.create_macd_chart(dates, prices, trade)
+    # The default 12/26/9 needs 35 bars
+    trade.update(macd_slow=26)
+    with pytest.raises(ValueError, match="Not enough data for MACD"):
+        charts.create_macd_chart(dates[:34], prices[:34], trade)
+    assert charts.create_macd_chart(dates[:35], prices[:35], trade)
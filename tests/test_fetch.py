@@ -0,0 +1,41 @@
+from trading import fetch
+
+# Concurrent keep-alive fetching against the fake feed
+
+def history_job(base_url, symbol):
+    return f"{base_url}/api/v3/historical-price-full/{symbol}?timeseries=30", {}
+
+def test_requests_run_concurrently(feed):
+    server, base_url = feed
+    server.delay = 0.3
+    jobs = {i: history_job(base_url, "AAPL") for i in range(8)}
+    results = fetch.fetch_all(jobs, deadline=5)
+    assert all(isinstance(body, bytes) and b"historical" in body for body in results.values())
+    assert server.requests == 8
+    # The feed saw the requests overlap
+    assert server.max_active > 1
+
+def test_connections_are_reused(feed):
+    server, base_url = feed
+    created = fetch.pool.created
+    for _ in range(5):
+        result = fetch.fetch_all({"AAPL": history_job(base_url, "AAPL")}, deadline=5)
+        assert isinstance(result["AAPL"], bytes)
+    assert server.requests == 5
+    assert server.connections == 1
+    assert fetch.pool.created == created + 1
+
+def test_deadline_is_shared(feed):
+    server, base_url = feed
+    server.delays = {"/api/v3/profile/TSLA": 2.0}
+    jobs = {"history": history_job(base_url, "AAPL"), "profile": (f"{base_url}/api/v3/profile/TSLA", {})}
+    results = fetch.fetch_all(jobs, deadline=0.5)
+    assert isinstance(results["history"], bytes)
+    assert isinstance(results["profile"], TimeoutError)
+    # fetch_all returned without waiting for the slow response
+    assert server.active == 1
+
+def test_http_errors_are_returned(feed):
+    _, base_url = feed
+    results = fetch.fetch_all({"missing": (f"{base_url}/nowhere", {})}, deadline=5)
+    assert isinstance(results["missing"], Exception)
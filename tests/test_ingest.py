@@ -0,0 +1,89 @@
+import io
+import json
+import numpy as np
+import pytest
+from trading import ingest
+
+# Streaming history reader against json.load on multi-symbol dumps
+
+def make_dump(path, symbols=40, bars=2000, indent=None):
+    rng = np.random.default_rng(0)
+    dates = [str(d) for d in (np.datetime64("2015-01-01") + np.arange(bars))][::-1]
+    entries = []
+    for i in range(symbols):
+        closes = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars))), 4)
+        entries.append({"symbol": f"S{i}", "companyName": f"Co {i}", "price": float(closes[0]),
+                        "historical": [{"date": d, "close": float(c)} for d, c in zip(dates, closes)]})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=indent, separators=None if indent else (",", ":"))
+    return path
+
+def reference(path, symbols=None):
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    out = []
+    for e in entries:
+        if symbols is None or e["symbol"] in symbols:
+            rows = sorted(e["historical"], key=lambda d: d["date"])
+            out.append((e["symbol"], np.array([d["date"] for d in rows], dtype="datetime64[D]"),
+                        np.array([d["close"] for d in rows])))
+    return out
+
+@pytest.mark.parametrize("indent", [None, 1])
+def test_matches_json_load(tmp_path, indent):
+    path = make_dump(tmp_path / "dump.json", indent=indent)
+    expected = reference(path)
+    with open(path, "rb") as f:
+        got = list(ingest.iter_json_histories(f))
+    assert [fields["symbol"] for fields, _, _ in got] == [symbol for symbol, _, _ in expected]
+    for (fields, dates, closes), (symbol, ref_dates, ref_closes) in zip(got, expected):
+        assert fields["companyName"] == f"Co {symbol[1:]}"
+        np.testing.assert_array_equal(dates, ref_dates)
+        np.testing.assert_array_equal(closes, ref_closes)
+
+@pytest.mark.parametrize("indent", [None, 1])
+def test_large_dump_rows_and_dtypes(tmp_path, indent):
+    # Long entries run through the batched fast path and the skip of
+    # unwanted symbols; timings against json.load live in benchmarks/bench.py
+    path = make_dump(tmp_path / "dump.json", symbols=20, bars=3653, indent=indent)
+    expected = reference(path)
+    with open(path, "rb") as f:
+        got = list(ingest.iter_json_histories(f))
+    assert len(got) == 20
+    for (fields, dates, closes), (symbol, ref_dates, ref_closes) in zip(got, expected):
+        assert fields["symbol"] == symbol
+        assert dates.dtype == np.dtype("datetime64[D]") and closes.dtype == np.float64
+        assert len(dates) == len(closes) == 3653
+        np.testing.assert_array_equal(dates, ref_dates)
+        np.testing.assert_array_equal(closes, ref_closes)
+    with open(path, "rb") as f:
+        (fields, dates, closes), = ingest.iter_json_histories(f, ["S19"])
+    assert fields["symbol"] == "S19"
+    np.testing.assert_array_equal(dates, expected[-1][1])
+    np.testing.assert_array_equal(closes, expected[-1][2])
+
+@pytest.mark.parametrize("read_size", [1, 7, 64])
+def test_buffer_boundaries(monkeypatch, read_size):
+    monkeypatch.setattr(ingest, "read_size", read_size)
+    entries = [
+        {"symbol": "A]", "companyName": "x \"}]{[\\", "historical": [
+            {"date": f"2024-01-0{i}", "close": i, "note": "a]},\"[{"} for i in range(1, 10)]},
+        {"symbol": "B", "historical": [{"date": f"2024-02-0{i}", "close": str(i * 2), "x": [1, [2, {"y": "]"}]]}
+                                       for i in range(1, 8)], "companyName": "B {co}"},
+        {"historical": [{"date": "2024-03-01T16:00:00", "close": 5}, {"date": "bad", "close": 1}], "symbol": "C"},
+        [1, 2], "junk",
+    ]
+    body = json.dumps(entries, indent=2).encode()
+    for symbols in (None, ["B"], ["A]", "C"]):
+        got = [(fields["symbol"], dates.astype(str).tolist(), closes.tolist())
+               for fields, dates, closes in ingest.iter_json_histories(io.BytesIO(body), symbols)]
+        expected = [(e["symbol"], [h["date"][:10] for h in e["historical"] if h["date"] != "bad"],
+                     [float(h["close"]) for h in e["historical"] if h["date"] != "bad"])
+                    for e in entries if isinstance(e, dict) and (symbols is None or e["symbol"] in symbols)]
+        assert got == expected
+
+def test_csv_symbol_filter():
+    body = b"Ticker,Date,Close\nA,2024-01-02,1.5\nB,2024-01-02,9\nA,2024-01-01,1.0\nA,oops,2\nA,2024-01-03,x\n"
+    dates, closes = ingest.read_csv_history(io.BytesIO(body), symbol_column="Ticker", symbol="a")
+    assert dates.astype(str).tolist() == ["2024-01-01", "2024-01-02"]
+    assert closes.tolist() == [1.0, 1.5]
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from trading import montecarlo
+
+# Monte Carlo touch probabilities and expected P&L
+
+def history(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = np.datetime64("2024-01-01") + np.arange(n)
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, (n, 2)), axis=0))
+    return dates, closes[:, 0] / closes[-1, 0] * 100.0, closes[:, 1] / closes[-1, 1] * 50.0
+
+def trade(**fields):
+    return dict({"short_call": 110.0, "long_call": 115.0, "premium": 1.5, "hedge_put_price": 45.0,
+                 "days_to_expiry": 30, "volatility": 0.3, "hedge_volatility": 0.4, "risk_free_rate": 0.0},
+                **fields)
+
+def test_barrier_at_or_through_spot_is_touched():
+    dates, stock, hedge = history()
+    # Spot 100 is already above the short call and below the hedge put
+    model = montecarlo.build_model(trade(short_call=95.0, long_call=100.0, hedge_put_price=55.0),
+                                   dates, stock, dates, hedge)
+    sim = montecarlo.simulate(model, paths=2_000, chunk=500, seed=1)
+    assert sim["touch_short_call"] == 1.0
+    assert sim["touch_hedge_put"] == 1.0
+    # A barrier exactly at spot counts as touched too
+    model = montecarlo.build_model(trade(short_call=100.0, long_call=105.0, hedge_put_price=50.0),
+                                   dates, stock, dates, hedge)
+    sim = montecarlo.simulate(model, paths=2_000, chunk=500, seed=1)
+    assert sim["touch_short_call"] == 1.0
+    assert sim["touch_hedge_put"] == 1.0
+
+def test_gbm_expected_pnl_matches_black_scholes():
+    # With no rate and a year to expiry (252 steps of 1/252) the GBM paths
+    # are risk-neutral, so E[P&L] is the credit less the spread's
+    # Black-Scholes value, and the hedge put at its BS premium breaks even
+    from trading.pricing import black_scholes
+    dates, stock, hedge = history()
+    t = trade(days_to_expiry=365)
+    model = montecarlo.build_model(t, dates, stock, dates, hedge)
+    assert model["steps"] == 252
+    sim = montecarlo.simulate(model, paths=50_000, seed=7)
+    calls = black_scholes(1, 100.0, [t["short_call"], t["long_call"]], 1.0, t["volatility"])["price"]
+    expected = (t["premium"] - (calls[0] - calls[1])) * 100
+    assert abs(sim["expected_spread"] - expected) < 4 * sim["stderr_spread"]
+    assert abs(sim["expected_combined"] - expected) < 4 * sim["stderr_combined"]
+    assert sim["hedge_premium"] == pytest.approx(float(black_scholes(-1, 50.0, t["hedge_put_price"], 1.0,
+                                                                     t["hedge_volatility"])["price"]))
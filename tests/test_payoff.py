@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from trading import payoff
+
+# Expiry P&L and summary against a hand-worked bear call spread: short 100
+# call, long 105 call, 2.00 credit, one contract of 100 shares.
+#   max profit  2.00 * 100           =  200
+#   max loss   (5.00 - 2.00) * 100   = -300
+#   breakeven   100 + 2.00           =  102
+
+def test_bear_call_spread_expiry_pnl():
+    legs = payoff.bear_call_spread(100.0, 105.0, 2.0)
+    prices = np.array([50.0, 100.0, 101.0, 102.0, 104.0, 105.0, 150.0])
+    np.testing.assert_allclose(payoff.expiry_pnl(legs, prices), [200, 200, 100, 0, -200, -300, -300])
+    # Contracts scale linearly; a price grid of any shape keeps its shape
+    legs = payoff.bear_call_spread(100.0, 105.0, 2.0, contracts=3)
+    np.testing.assert_allclose(payoff.expiry_pnl(legs, prices.reshape(7, 1)).ravel(),
+                               3 * np.array([200, 200, 100, 0, -200, -300, -300]))
+
+def test_bear_call_spread_summary():
+    s = payoff.summary(payoff.bear_call_spread(100.0, 105.0, 2.0))
+    assert s["max_profit"] == pytest.approx(200.0)
+    assert s["max_loss"] == pytest.approx(-300.0)
+    np.testing.assert_allclose(s["breakevens"], [102.0])
+
+def test_unbounded_legs_and_books():
+    # A naked short call has unlimited loss; a long put's profit is capped at strike - premium
+    s = payoff.summary(payoff.make_legs([("call", 100.0, -1, 2.0)]))
+    assert s["max_profit"] == pytest.approx(200.0) and s["max_loss"] == -np.inf
+    np.testing.assert_allclose(s["breakevens"], [102.0])
+    s = payoff.summary(payoff.long_put(50.0, 1.5))
+    assert s["max_profit"] == pytest.approx(4850.0) and s["max_loss"] == pytest.approx(-150.0)
+    np.testing.assert_allclose(s["breakevens"], [48.5])
+    # Spread on the stock, hedge put on a second underlying, P&L per position
+    book = payoff.combine(payoff.bear_call_spread(100.0, 105.0, 2.0, underlying=0, position=0),
+                          payoff.long_put(50.0, 1.5, underlying=1, position=1))
+    pnl = payoff.position_pnl(book, np.array([[104.0, 40.0], [90.0, 60.0]]))
+    np.testing.assert_allclose(pnl, [[-200.0, 850.0], [200.0, -150.0]])
+    with pytest.raises(ValueError):
+        payoff.summary(book)
@@ -0,0 +1,37 @@
+import numpy as np
+from trading import data, fake_feed, price_store
+
+# Price store merges: de-duplication on date, new bars win
+
+def test_merge_deduplicates_and_revises(tmp_path):
+    root = str(tmp_path)
+    dates = np.datetime64("2024-01-01") + np.arange(5)
+    price_store.merge_symbol("x", dates, [1.0, 2.0, 3.0, 4.0, 5.0], "X Corp", root=root)
+    # Overlaps the last two bars (one revised), out of order
+    price_store.merge_symbol("X", dates[[4, 3]].tolist() + [np.datetime64("2024-01-06")], [50.0, 4.0, 6.0],
+                             root=root)
+    name, price, stored_dates, closes = price_store.load_symbol("X", root)
+    assert name == "X Corp"
+    np.testing.assert_array_equal(stored_dates, np.datetime64("2024-01-01") + np.arange(6))
+    np.testing.assert_array_equal(closes, [1.0, 2.0, 3.0, 4.0, 50.0, 6.0])
+    assert price == 6.0
+    assert price_store.load_index(root)["X"]["length"] == 6
+
+def test_incremental_sync_matches_feed(feed):
+    # Full history, then the held-back bars one sync at a time (each sync
+    # re-fetches the last stored bar), then a revision of the last close
+    server, _ = feed
+    pending = fake_feed.hold_back(server.feed, 5)
+    data.load_many(["AAPL"], betas=False)
+    for _ in range(5):
+        fake_feed.release(server, pending)
+        data.load_many(["AAPL"], betas=False, use_cache=False)
+    with server.lock:
+        latest = server.feed["AAPL"]["historical"][0]
+        server.feed["AAPL"]["historical"][0] = dict(latest, close=latest["close"] + 1.0)
+    data.load_many(["AAPL"], betas=False, use_cache=False)
+    _, _, dates, closes = price_store.load_symbol("AAPL", price_store.store_dir)
+    rows = server.feed["AAPL"]["historical"][::-1]
+    assert len(np.unique(dates)) == len(dates) == len(rows)
+    np.testing.assert_array_equal(dates, np.array([d["date"] for d in rows], dtype="datetime64[D]"))
+    np.testing.assert_array_equal(closes, [d["close"] for d in rows])
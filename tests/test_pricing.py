@@ -0,0 +1,60 @@
+import math
+import numpy as np
+import pytest
+from trading import payoff, pricing
+
+# Black-Scholes against reference values, put-call parity and finite differences
+
+def test_norm_cdf_matches_erfc():
+    # Hart's approximation is exact to double precision in absolute terms;
+    # deep in the tails the relative error grows to ~1e-8
+    x = np.linspace(-40.0, 40.0, 4001)
+    expected = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+    np.testing.assert_allclose(pricing.norm_cdf(x), expected, rtol=0, atol=1e-15)
+    tail = np.abs(x) <= 20
+    np.testing.assert_allclose(pricing.norm_cdf(x[tail]), expected[tail], rtol=1e-8, atol=0)
+
+def test_reference_prices():
+    # Hull's textbook case: S 100, K 100, 1 year, 20% vol, 5% rate
+    g = pricing.black_scholes([1, -1], 100.0, 100.0, 1.0, 0.2, 0.05)
+    np.testing.assert_allclose(g["price"], [10.450584, 5.573526], atol=1e-6)
+    np.testing.assert_allclose(g["delta"], [0.636831, -0.363169], atol=1e-6)
+
+def test_put_call_parity():
+    spot = np.linspace(50.0, 150.0, 21)[:, None]
+    strike, expiry, vol, rate, div = 100.0, np.array([0.01, 0.25, 1.0, 3.0]), 0.35, 0.03, 0.01
+    call = pricing.black_scholes(1, spot, strike, expiry, vol, rate, div)
+    put = pricing.black_scholes(-1, spot, strike, expiry, vol, rate, div)
+    forward = spot * np.exp(-div * expiry) - strike * np.exp(-rate * expiry)
+    np.testing.assert_allclose(call["price"] - put["price"], forward, atol=1e-10)
+    np.testing.assert_allclose(call["delta"] - put["delta"], np.exp(-div * expiry) + 0 * spot, atol=1e-12)
+
+def test_greeks_match_finite_differences():
+    kind, spot, strike, expiry, vol, rate = np.array([1.0, -1.0]), 105.0, 100.0, 0.5, 0.25, 0.04
+    g = pricing.black_scholes(kind, spot, strike, expiry, vol, rate)
+
+    def price(**bumped):
+        args = dict(spot=spot, expiry=expiry, vol=vol)
+        args.update(bumped)
+        return pricing.black_scholes(kind, args["spot"], strike, args["expiry"], args["vol"], rate)["price"]
+    h = 1e-3
+    np.testing.assert_allclose(g["delta"], (price(spot=spot + h) - price(spot=spot - h)) / (2 * h), atol=1e-6)
+    np.testing.assert_allclose(g["gamma"], (price(spot=spot + h) - 2 * g["price"] + price(spot=spot - h)) / h ** 2,
+                               atol=1e-4)
+    # vega per vol point, theta per calendar day (time to expiry shrinking)
+    np.testing.assert_allclose(g["vega"], (price(vol=vol + 1e-4) - price(vol=vol - 1e-4)) / 2e-4 / 100, atol=1e-6)
+    day = 1 / pricing.days_per_year
+    np.testing.assert_allclose(g["theta"], (price(expiry=expiry - 1e-4) - price(expiry=expiry + 1e-4)) / 2e-4 * day,
+                               atol=1e-6)
+
+def test_expired_and_leg_greeks():
+    g = pricing.black_scholes([1, -1], 110.0, 100.0, 0.0, 0.2)
+    np.testing.assert_allclose(g["price"], [10.0, 0.0])
+    np.testing.assert_allclose(g["delta"], [1.0, 0.0])
+    # Leg greeks are the option greeks times signed qty and the multiplier
+    legs = payoff.bear_call_spread(100.0, 105.0, 2.0, contracts=2)
+    greeks = pricing.leg_greeks(legs, 102.0, 0.25, 0.3, 0.01)
+    single = pricing.black_scholes(1, 102.0, np.array([100.0, 105.0]), 0.25, 0.3, 0.01)
+    for name in ("price", "delta", "gamma", "theta", "vega"):
+        np.testing.assert_allclose(greeks[name], single[name] * [-200, 200])
+    assert pricing.historical_volatility(np.full(10, 50.0)) == pytest.approx(0.0)
@@ -0,0 +1,25 @@
+import numpy as np
+from trading import price_store, scanner
+
+# Panel loading: gaps are carried forward, but never past a symbol's last close
+
+def test_stale_symbols_are_not_scanned(tmp_path):
+    root = str(tmp_path)
+    dates = np.datetime64("2024-01-01") + np.arange(120)
+    closes = 100.0 + np.sin(np.arange(120) / 5.0) * 10.0
+    price_store.merge_symbol("LIVE", dates, closes, "Live Corp", root=root)
+    # A missing bar in the middle is filled from the day before
+    gap = np.arange(120) != 60
+    price_store.merge_symbol("GAPPY", dates[gap], closes[gap], "Gappy Corp", root=root)
+    # Stopped updating ten bars before the others
+    price_store.merge_symbol("GONE", dates[:110], closes[:110], "Gone Corp", root=root)
+    symbols, names, panel_dates, panel = scanner.load_panel(root=root, bars=100)
+    assert symbols == ["GAPPY", "GONE", "LIVE"]
+    assert panel_dates[-1] == dates[-1]
+    assert panel[0, panel_dates == dates[60]][0] == closes[59]
+    assert np.isnan(panel[1, -10:]).all() and not np.isnan(panel[1, :-10]).any()
+    result = scanner.scan(panel)
+    np.testing.assert_array_equal(result["valid"], [True, False, True])
+    np.testing.assert_array_equal(result["stale"], [False, True, False])
+    table = scanner.format_table(symbols, names, result, np.array([0, 2]), panel_dates[-1])
+    assert "stale symbols" in table and "GONE" in table
@@ -0,0 +1,31 @@
+import os
+import numpy as np
+import pytest
+from trading import server
+
+# Report daemon: where "output": "path" requests may write
+
+def trade(**kw):
+    return dict({"stock_symbol": "AAPL", "hedge_symbol": "TSLA", "short_call": 216, "long_call": 220,
+                 "premium": 2.5, "hedge_put_price": 250, "expiration": "28/06/25", "target_price": 215,
+                 "mc_paths": 0, "output": "path"}, **kw)
+
+@pytest.fixture
+def service(tmp_path):
+    service = server.ReportService(out_dir=str(tmp_path / "out"))
+    dates = np.datetime64("2024-01-01") + np.arange(120)
+    closes = np.linspace(200.0, 215.0, 120)
+    service.histories_for = lambda symbols: {s: (s, "1.00", dates, closes) for s in symbols}
+    return service
+
+@pytest.mark.parametrize("filename", ["../escaped.pdf", "../../tmp/escaped.pdf", "/tmp/escaped.pdf", "sub/x.pdf",
+                                      ".."])
+def test_filename_outside_out_dir_rejected(service, tmp_path, filename):
+    with pytest.raises(ValueError):
+        service.build(trade(filename=filename))
+    assert not os.path.exists(tmp_path / "escaped.pdf")
+
+def test_plain_filename_written_to_out_dir(service, tmp_path):
+    path, _ = service.build(trade(filename="report.pdf"))
+    assert path == str(tmp_path / "out" / "report.pdf")
+    assert os.path.getsize(path) > 0
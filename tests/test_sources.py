@@ -0,0 +1,90 @@
+import time
+import pytest
+from trading import data
+from trading.sources import Registry
+
+# Source races: first valid result wins, hedging, fallbacks and stats
+
+def source(result=None, delay=0.0, error=None, calls=None):
+    def fn(key, timeout):
+        if calls is not None:
+            calls.append(key)
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+    return fn
+
+def test_first_valid_result_wins():
+    registry = Registry()
+    registry.register("slow", source("slow", delay=1.0), priority=0)
+    registry.register("fast", source("fast", delay=0.05), priority=1)
+    registry.register("local", source("local"), fallback=True)
+    start = time.perf_counter()
+    assert registry.race("X", hedge=0.1) == ("fast", "fast")
+    assert time.perf_counter() - start < 0.5
+    # The slow source was given up on and now ranks behind the fast one
+    assert registry.stats["slow"]["errors"] == 1
+    assert [s.name for s in registry.ordered()[0]] == ["fast", "slow"]
+
+def test_failure_hedges_immediately():
+    registry = Registry()
+    registry.register("down", source(error=OSError("down")), priority=0)
+    registry.register("empty", source([]), priority=1)
+    registry.register("up", source("up"), priority=2)
+    start = time.perf_counter()
+    assert registry.race("X", hedge=5.0, valid=lambda r: bool(r)) == ("up", "up")
+    assert time.perf_counter() - start < 1.0
+    assert registry.stats["empty"]["errors"] == 1
+
+def test_fallbacks_only_after_live_sources_fail():
+    calls = []
+    registry = Registry()
+    registry.register("live", source(error=OSError("down")))
+    registry.register("stored", source(None, calls=calls), priority=0, fallback=True)
+    registry.register("sim", source("sim", calls=calls), priority=1, fallback=True)
+    assert registry.race("X") == ("sim", "sim")
+    assert calls == ["X", "X"]
+    # A winning live source never reaches them
+    calls.clear()
+    registry.register("live", source("live"))
+    assert registry.race("X") == ("live", "live")
+    assert calls == []
+
+def test_no_source_raises():
+    registry = Registry()
+    registry.register("down", source(error=OSError("down")))
+    with pytest.raises(LookupError, match="down"):
+        registry.race("X")
+
+def test_stats_follow_path(tmp_path):
+    path = [str(tmp_path / "a.json")]
+    registry = Registry(lambda: path[0])
+    registry.register("up", source("up"))
+    registry.race("X")
+    assert (tmp_path / "a.json").exists()
+    path[0] = str(tmp_path / "b.json")
+    registry.race("X")
+    assert registry.stats["up"]["calls"] == 1
+
+def test_load_many_races_the_feed(feed):
+    server, _ = feed
+    loaded = data.load_many(["AAPL", "ZZZZ"], betas=False)
+    name, _, dates, closes, _ = loaded["AAPL"]
+    assert name == "Apple Inc." and len(dates) == len(server.feed["AAPL"]["historical"])
+    # Unknown to the feed: FMP returns no history and the fallbacks have none
+    assert len(loaded["ZZZZ"][2]) == 0
+    stats = data.history_sources.stats
+    assert stats["fmp"]["calls"] == 2 and stats["fmp"]["errors"] == 1
+    assert "stooq" not in stats and "yahoo" not in stats
+    fmp = next(line for line in data.history_sources.report().splitlines() if line.startswith("fmp"))
+    assert fmp.split()[1:3] == ["2", "1"]
+
+def test_load_many_falls_back_when_the_feed_is_slow(feed):
+    server, _ = feed
+    server.delay = 2.0
+    start = time.perf_counter()
+    loaded = data.load_many(["AAPL"], betas=False, deadline=0.5)
+    assert time.perf_counter() - start < 1.5
+    # Sim Data stands in
+    assert len(loaded["AAPL"][2]) > 0
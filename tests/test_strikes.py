@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from trading import strikes
+
+# Pareto fronts against a brute-force dominance check
+
+def dominated(values):
+    # Row i is dominated if some row is at least as good everywhere and better somewhere
+    at_least = (values[None, :, :] >= values[:, None, :]).all(axis=-1)
+    better = (values[None, :, :] > values[:, None, :]).any(axis=-1)
+    return (at_least & better).any(axis=1)
+
+@pytest.mark.parametrize("objectives", [("a", "b"), ("a", "b", "c")])
+def test_pareto_keeps_exactly_the_non_dominated(objectives, monkeypatch):
+    # Small blocks so the three-objective path crosses block boundaries
+    monkeypatch.setattr(strikes, "pareto_block", 64)
+    rng = np.random.default_rng(3)
+    candidates = {key: rng.random(1000) for key in objectives}
+    front = strikes.pareto(candidates, objectives)
+    values = np.column_stack([candidates[key] for key in objectives])
+    assert sorted(front) == list(np.flatnonzero(~dominated(values)))
+    # Best first objective first
+    assert (np.diff(candidates["a"][front]) <= 0).all()
+
+def test_pareto_ties_keep_one():
+    candidates = {"a": np.array([1.0, 1.0, 2.0, 0.5]), "b": np.array([1.0, 1.0, 0.5, 0.5])}
+    assert sorted(strikes.pareto(candidates, ("a", "b"))) in ([0, 2], [1, 2])
+    candidates["c"] = np.zeros(4)
+    assert sorted(strikes.pareto(candidates, ("a", "b", "c"))) in ([0, 2], [1, 2])
+    assert len(strikes.pareto({"a": np.array([]), "b": np.array([])}, ("a", "b"))) == 0
+
+def test_optimize_returns_the_front_of_the_sweep():
+    chain = strikes.synthetic_chain("X", 100.0, 30 / 365, 0.3)
+    candidates = strikes.sweep(chain)
+    front, evaluated = strikes.optimize(chain)
+    assert evaluated == len(candidates["credit"])
+    values = np.column_stack((candidates["risk_reward"], candidates["pop"]))
+    efficient = values[~dominated(values)]
+    got = np.column_stack((front["risk_reward"], front["pop"]))
+    assert len(got) and {tuple(v) for v in got} == {tuple(v) for v in efficient}
+    # Every pair is a credit spread with short < long
+    assert (front["short_call"] < front["long_call"]).all() and (front["credit"] > 0).all()
@@ -0,0 +1,56 @@
+import numpy as np
+from trading import fake_feed, indicators, watch
+
+# Incrementally updated indicators against the batch ones, on bars
+# replayed from the fake feed
+
+def test_incremental_indicators_match_batch(feed, tmp_path):
+    server, _ = feed
+    pending = fake_feed.hold_back(server.feed, 30)
+    position = {"stock_symbol": "AAPL", "hedge_symbol": "TSLA", "short_call": 216, "long_call": 220, "premium": 2.5,
+                "hedge_put_price": 250, "expiration": "28/06/25", "target_price": 215, "mc_paths": 0}
+    w = watch.Watch([position], str(tmp_path))
+    w.poll()
+    state = w.states["AAPL"]
+    bands, macd = state.bollinger(20, 2.0), state.macd(12, 26, 9)
+    for _ in range(30):
+        fake_feed.release(server, pending)
+        assert "AAPL" in w.poll()
+    # A revised last close updates the indicators in place
+    with server.lock:
+        latest = server.feed["AAPL"]["historical"][0]
+        server.feed["AAPL"]["historical"][0] = dict(latest, close=latest["close"] + 3.0)
+    assert w.poll() == ["AAPL"]
+    prices = state.prices.values
+    np.testing.assert_array_equal(prices, [d["close"] for d in server.feed["AAPL"]["historical"][::-1]])
+    ma, upper, lower = indicators.bollinger_bands(prices, 20, 2.0)
+    line, signal, _ = indicators.macd(prices, 12, 26, 9)
+    for got, expected in zip(bands.series(), (ma, upper, lower)):
+        np.testing.assert_allclose(got, expected, rtol=0, atol=1e-9, equal_nan=True)
+    for got, expected in zip(macd.series(), (line, signal)):
+        np.testing.assert_allclose(got, expected, rtol=0, atol=1e-9)
+
+def test_refresh_reuses_simulation(feed, tmp_path, monkeypatch):
+    from trading import report
+    calls = {"price_trade": 0, "simulate_report": 0}
+
+    def counted(name):
+        fn = getattr(report, name)
+
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return fn(*args, **kwargs)
+        return wrapper
+    for name in calls:
+        monkeypatch.setattr(report, name, counted(name))
+    position = {"stock_symbol": "AAPL", "hedge_symbol": "TSLA", "short_call": 216, "long_call": 220, "premium": 2.5,
+                "hedge_put_price": 250, "expiration": "28/06/25", "target_price": 215, "mc_paths": 500}
+    w = watch.Watch([position], str(tmp_path))
+    w.poll()
+    w.refresh_all()
+    assert calls == {"price_trade": 1, "simulate_report": 1}
+    assert w.rendered[0][2][1] is not None
+    # New versions with the same closes re-render the charts but keep the simulation
+    w.states["AAPL"].version += 1
+    assert w.refresh(0)[1] == ["pl", "bollinger", "macd"]
+    assert calls == {"price_trade": 2, "simulate_report": 1}
@@ -0,0 +1,3 @@
+from trading.cli import main
+
+raise SystemExit(main())
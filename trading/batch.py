@@ -0,0 +1,165 @@
+import os
+import csv
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from trading import report
+from trading import timing
+from trading.data import load_many, history_sources
+from trading.cache import cache
+
+# --- Positions file ---
+# CSV with a header row, or a JSON list of objects, using the same field
+# names as the Version 53 inputs. An optional "filename" overrides the
+# generated report name.
+float_fields = ("short_call", "long_call", "premium", "hedge_put_price", "delta", "hedge_delta", "target_price",
+                "bollinger_width", "volatility", "hedge_volatility", "risk_free_rate", "hedge_premium")
+int_fields = ("contract_size", "bollinger_window", "macd_fast", "macd_slow", "macd_signal", "vol_window", "mc_paths")
+required_fields = ("stock_symbol", "hedge_symbol", "short_call", "long_call", "premium", "hedge_put_price",
+                   "expiration", "target_price")
+
+def read_positions(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".json"):
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(f))
+    return [parse_position(row, f"Position {n} in {path}") for n, row in enumerate(rows, 1)]
+
+def parse_position(row, label="Position"):
+    row = {k.strip(): v.strip() if isinstance(v, str) else v for k, v in row.items() if k and v not in (None, "")}
+    missing = [k for k in required_fields if k not in row]
+    if missing:
+        raise ValueError(f"{label} is missing {', '.join(missing)}")
+    for k in float_fields:
+        if k in row:
+            row[k] = float(row[k])
+    for k in int_fields:
+        if k in row:
+            row[k] = int(row[k])
+    row["stock_symbol"] = row["stock_symbol"].upper()
+    row["hedge_symbol"] = row["hedge_symbol"].upper()
+    return row
+
+def report_filename(trade):
+    if "filename" in trade:
+        return trade["filename"]
+    expiry = trade["expiration"].replace("/", "-")
+    return f"{trade['stock_symbol']} {trade['short_call']:g}-{trade['long_call']:g} {expiry} Bear Call Spread.pdf"
+
+def load_symbols(symbols):
+    histories = {}
+    for symbol, (name, _, dates, prices, beta) in load_many(symbols).items():
+        histories[symbol] = (name, beta, dates, prices)
+    return histories
+
+# --- Workers ---
+_histories = {}
+
+def _init_worker(histories):
+    _histories.update(histories)
+
+def _build_report(trade, out_dir, chart_format="vector", chart_dpi=None, timings=False):
+    start = time.perf_counter()
+    stock_name, stock_beta, stock_dates, stock_prices = _histories[trade["stock_symbol"]]
+    hedge_name, hedge_beta, hedge_dates, hedge_prices = _histories[trade["hedge_symbol"]]
+    trade = dict(trade, stock_name=stock_name, stock_beta=stock_beta, hedge_name=hedge_name, hedge_beta=hedge_beta)
+    filename = os.path.join(out_dir, report_filename(trade))
+    session = timing.Session(label=os.path.basename(filename)).start() if timings else None
+    # Charts render serially inside each worker; the pool parallelises across reports.
+    report.generate_pdf(trade, stock_dates, stock_prices, hedge_dates, hedge_prices, filename, chart_workers=1,
+                        chart_format=chart_format, chart_dpi=chart_dpi)
+    stages = None
+    if session is not None:
+        session.stop().write(timing.report_path(filename))
+        stages = session.stages()
+    return filename, time.perf_counter() - start, stages
+
+def write_batch_timings(path, load_time, total, workers, results):
+    # Stage means across the batch plus per-report wall times, for sizing the
+    # worker pool
+    totals = {}
+    for _, _, stages in results:
+        for s in stages or ():
+            t = totals.setdefault(s["stage"], {"stage": s["stage"], "calls": 0, "seconds": 0.0})
+            t["calls"] += s["calls"]
+            t["seconds"] += s["seconds"]
+    for t in totals.values():
+        t["mean_seconds"] = round(t["seconds"] / t["calls"], 6)
+        t["seconds"] = round(t["seconds"], 6)
+    body = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cpus": os.cpu_count(),
+        "workers": workers,
+        "reports": len(results),
+        "load_seconds": round(load_time, 6),
+        "total_seconds": round(total, 6),
+        "throughput_per_second": round(len(results) / max(total - load_time, 1e-9), 3),
+        "stages": sorted(totals.values(), key=lambda t: t["stage"]),
+        "report_seconds": {os.path.basename(f): round(elapsed, 6) for f, elapsed, _ in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(body, f, indent=1)
+    return path
+
+def run_batch(positions, out_dir, workers=None, chart_format="vector", chart_dpi=None, timings=False):
+    # timings writes stage timings next to each PDF and a batch summary to
+    # "batch timings.json" in out_dir
+    started = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    symbols = sorted({p["stock_symbol"] for p in positions} | {p["hedge_symbol"] for p in positions})
+    histories = load_symbols(symbols)
+    load_time = time.perf_counter() - started
+    print(f"Loaded {len(symbols)} symbols in {load_time:.2f}s ({cache.summary()})")
+    print(history_sources.report())
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(positions)))
+    results, failures = [], []
+
+    def record(n, trade, future_result):
+        try:
+            filename, elapsed, stages = future_result()
+            results.append((filename, elapsed, stages))
+            print(f"[{n}/{len(positions)}] {trade['stock_symbol']} -> {filename} ({elapsed:.2f}s)")
+        except Exception as e:
+            failures.append((trade, e))
+            print(f"[{n}/{len(positions)}] {trade['stock_symbol']} FAILED: {e}")
+
+    if workers == 1:
+        _init_worker(histories)
+        for n, trade in enumerate(positions, 1):
+            record(n, trade, lambda: _build_report(trade, out_dir, chart_format, chart_dpi, timings))
+    else:
+        ctx = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_worker, initargs=(histories,)) as pool:
+            futures = {pool.submit(_build_report, trade, out_dir, chart_format, chart_dpi, timings): trade for trade in positions}
+            for n, future in enumerate(as_completed(futures), 1):
+                record(n, futures[future], future.result)
+
+    total = time.perf_counter() - started
+    render_times = [elapsed for _, elapsed, _ in results]
+    print(f"Generated {len(results)}/{len(positions)} reports in {total:.2f}s "
+          f"(data {load_time:.2f}s, {workers} workers)")
+    if render_times:
+        print(f"Per report: avg {sum(render_times) / len(render_times):.2f}s, max {max(render_times):.2f}s, "
+              f"throughput {len(results) / (total - load_time):.1f}/s")
+    if timings:
+        print(write_batch_timings(os.path.join(out_dir, "batch timings.json"), load_time, total, workers, results))
+    return results, failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate bear call spread reports for a list of positions")
+    parser.add_argument("positions", help="CSV or JSON list of positions")
+    parser.add_argument("-o", "--out", default="Reports", help="output folder")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--charts", choices=("vector", "png"), default="vector", help="chart embedding (default: vector)")
+    parser.add_argument("--dpi", type=int, default=None, help="PNG chart resolution (default: figure dpi)")
+    parser.add_argument("--timings", action="store_true", help="write stage timings as JSON next to each PDF")
+    args = parser.parse_args()
+    _, failed = run_batch(read_positions(args.positions), args.out, args.workers, args.charts, args.dpi, args.timings)
+    raise SystemExit(1 if failed else 0)
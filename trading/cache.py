@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from trading import price_store
+
+cache_dir = os.path.join(price_store.base_dir, "Cache")
+
+# Max age in seconds per endpoint. History only gains a bar per day (for
+# history this is how long a price store sync stays fresh), while company
+# names and 5Y beta barely move.
+ttls = {
+    "history": 12 * 3600,
+    "profile": 30 * 86400,
+    "beta": 7 * 86400,
+}
+
+# --- Disk cache ---
+# One file per (source, symbol, endpoint): a JSON header line followed by the
+# raw payload. File mtime is the LRU clock (touched on every hit) and the
+# header records when the payload was fetched. Loaders share the cache
+# across threads: a corrupt entry or one removed mid-read is a miss, and the
+# stats and size accounting are kept under a lock.
+class DiskCache:
+    def __init__(self, root=cache_dir, max_bytes=200 * 1024 * 1024, ttls=ttls):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttls = dict(ttls)
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "stores": 0, "evictions": 0}
+        self._size = None
+        self.lock = threading.Lock()
+
+    def path(self, key):
+        digest = hashlib.sha1("\x1f".join(key).encode()).hexdigest()
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _read(self, key):
+        try:
+            with open(self.path(key), "rb") as f:
+                header, payload = f.read().split(b"\n", 1)
+            return float(json.loads(header)["stored"]), payload
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            # ValueError covers json.JSONDecodeError and a missing header line
+            return None
+
+    def _count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def get(self, key, max_age=None):
+        if max_age is None:
+            max_age = self.ttls.get(key[-1], 0)
+        entry = self._read(key)
+        if entry is None:
+            self._count("misses")
+            return None
+        stored, payload = entry
+        if time.time() - stored > max_age:
+            self._count("stale")
+            return None
+        try:
+            os.utime(self.path(key))
+        except FileNotFoundError:
+            # Replaced or evicted since the read; the payload is still good
+            pass
+        self._count("hits")
+        return payload
+
+    def put(self, key, payload):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        header = json.dumps({"key": list(key), "stored": time.time()}).encode()
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(header + b"\n" + payload)
+        try:
+            old = os.path.getsize(path)
+        except FileNotFoundError:
+            old = 0
+        os.replace(tmp, path)
+        with self.lock:
+            self.stats["stores"] += 1
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += len(header) + 1 + len(payload) - old
+            full = self._size > self.max_bytes
+        if full:
+            self.evict()
+
+    def _entries(self):
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith(".tmp"):
+                    try:
+                        st = os.stat(os.path.join(dirpath, name))
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, os.path.join(dirpath, name)))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, target=None):
+        # Drop least recently used entries until the cache is back under target
+        if target is None:
+            target = self.max_bytes * 0.9
+        with self.lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    self.stats["evictions"] += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+            self._size = total
+
+    def clear(self):
+        self.evict(target=0)
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"] + stats["stale"]
+        rate = stats["hits"] / lookups if lookups else 0.0
+        return (f"cache hits {stats['hits']}, misses {stats['misses']}, stale {stats['stale']}, "
+                f"stores {stats['stores']}, evictions {stats['evictions']} ({rate:.0%} hit rate)")
+
+cache = DiskCache()
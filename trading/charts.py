@@ -0,0 +1,351 @@
+import os
+import time
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.dates import DateFormatter, date2num
+from matplotlib.collections import LineCollection
+from trading.indicators import bollinger_bands, crossovers, macd as macd_lines
+from trading.payoff import bear_call_spread, expiry_pnl, summary
+from trading.pricing import model_pnl, days_per_year
+from trading.vector import figure_drawing
+from trading import timing
+
+# Charts are built on bare Figure/Agg canvases (no pyplot state) so they can
+# be rendered in worker processes. Each create_* function returns PNG bytes,
+# or a reportlab Drawing with fmt="vector".
+# `trade` is a dict with the report inputs: stock_name, hedge_name,
+# short_call, long_call, premium, hedge_put_price, bollinger_window,
+# bollinger_width, macd_fast, macd_slow, macd_signal, and optionally
+# days_to_expiry, volatility and risk_free_rate for pre-expiry P&L curves.
+# The indicator charts take optional precomputed series (bands as
+# (ma, upper, lower), lines as (macd, signal)) aligned with prices, e.g.
+# from incrementally updated indicators.
+
+def new_figure(figsize):
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+def to_png(fig, **kwargs):
+    buf = BytesIO()
+    fig.savefig(buf, format="png", **kwargs)
+    return buf.getvalue()
+
+def render(fig, fmt="png", dpi=None, tight=False):
+    # fmt "png": PNG bytes at dpi (figure dpi by default); "vector": reportlab Drawing
+    if fmt == "vector":
+        return figure_drawing(fig, tight)
+    if tight:
+        return to_png(fig, dpi=dpi or "figure", bbox_inches="tight")
+    return to_png(fig, dpi=dpi or "figure")
+
+def date_numbers(dates):
+    # Matplotlib date numbers, converted once per chart; lines given numbers
+    # skip the unit conversion (the axis still gets date units from
+    # update_units)
+    return date2num(np.asarray(dates, dtype="datetime64[D]"))
+
+def simplify_xaxis(ax):
+    ax.xaxis.set_major_formatter(DateFormatter('%m'))
+
+# --- Templates ---
+# Each chart layout (figure, axes, artists, grid, formatters) is built once
+# per process; create_* only swaps line data, limits and labels before
+# re-rendering the Agg canvas.
+_templates = {}
+
+def template(name):
+    t = _templates.get(name)
+    if t is None:
+        t = _templates[name] = _builders[name]()
+    return t
+
+def clear_templates():
+    _templates.clear()
+
+def set_legend(t, ax, **kwargs):
+    # Rebuild the legend only when the set of labelled artists changes
+    handles, labels = ax.get_legend_handles_labels()
+    key = (id(ax), "legend")
+    legend = ax.get_legend()
+    if legend is not None and t.get(key) == handles:
+        for text, label in zip(legend.get_texts(), labels):
+            text.set_text(label)
+        return
+    ax.legend(handles, labels, **kwargs)
+    t[key] = handles
+
+def show_line(line, x, y, label):
+    line.set_data(x, y)
+    line.set_visible(True)
+    line.set_label(label)
+
+def hide_line(line):
+    line.set_data([], [])
+    line.set_visible(False)
+    line.set_label("_hidden")
+
+def set_level(line, value, label, horizontal=True):
+    if horizontal:
+        line.set_ydata([value, value])
+    else:
+        line.set_xdata([value, value])
+    line.set_label(label)
+
+def rescale(ax, scalex=True, scaley=True):
+    ax.relim(visible_only=True)
+    ax.autoscale_view(scalex=scalex, scaley=scaley)
+
+def _build_pl():
+    fig = new_figure((6, 2.5))
+    ax = fig.subplots()
+    t = {"fig": fig, "ax": ax, "fills": []}
+    t["pnl"], = ax.plot([], [], linewidth=1.5, label="P&L")
+    t["curves"] = [ax.plot([], [], linestyle=style, linewidth=1.2)[0] for style in (":", "-.")]
+    t["max_profit"] = ax.axhline(0, color="green", linestyle="--", linewidth=2)
+    t["max_loss"] = ax.axhline(0, color="red", linestyle="--", linewidth=2)
+    t["breakeven"] = ax.axvline(0, color="gray", linestyle="--", linewidth=2)
+    t["title"] = ax.set_title("", fontsize=10)
+    ax.grid(True)
+    return t
+
+def create_pl_chart(trade, fmt="png", dpi=None):
+    short_call, long_call, premium = trade["short_call"], trade["long_call"], trade["premium"]
+    t = template("pl")
+    ax = t["ax"]
+    legs = bear_call_spread(short_call, long_call, premium)
+    x = np.linspace(short_call - 20, long_call + 20, 500)
+    y = expiry_pnl(legs, x)
+    t["pnl"].set_data(x, y)
+    days = trade.get("days_to_expiry", 0)
+    # Mark-to-model curves today and halfway to expiry
+    for line, d in zip(t["curves"], (days, days // 2)):
+        if d > 0 and trade.get("volatility"):
+            curve = model_pnl(legs, x, d / days_per_year, trade["volatility"], trade.get("risk_free_rate", 0.0))
+            show_line(line, x, curve.sum(axis=-1), f"T-{d}d")
+        else:
+            hide_line(line)
+    stats = summary(legs)
+    max_profit = stats["max_profit"]
+    max_loss = stats["max_loss"]
+    breakeven = stats["breakevens"][0]
+    set_level(t["max_profit"], max_profit, "Max Profit ($" + str(int(max_profit)) + ")")
+    set_level(t["max_loss"], max_loss, "Max Loss ($" + str(int(max_loss)) + ")")
+    set_level(t["breakeven"], breakeven, "Breakeven ($" + str(int(breakeven)) + ")", horizontal=False)
+    for fill in t["fills"]:
+        fill.remove()
+    t["fills"] = [
+        ax.fill_between(x, y, where=(x >= breakeven), facecolor="green", alpha=0.3),
+        ax.fill_between(x, y, where=(x < breakeven), facecolor="red", alpha=0.3),
+    ]
+    y_min = min(0, max_loss)
+    y_max = max(0, max_profit)
+    padding = (y_max - y_min) * 0.1
+    rescale(ax, scaley=False)
+    ax.set_ylim(y_min - padding, y_max + padding)
+    t["title"].set_text(f"{trade['stock_name']} Bear Call Spread Report - P&L Chart")
+    set_legend(t, ax, fontsize=8)
+    return render(t["fig"], fmt, dpi)
+
+def _build_hedge():
+    fig = new_figure((6 * 0.9, 2.5))
+    ax = fig.subplots()
+    t = {"fig": fig, "ax": ax}
+    t["price"], = ax.plot([], [], label='Hedge Price', linewidth=1.5)
+    t["upper"], = ax.plot([], [], linestyle="--", color="blue")
+    t["lower"], = ax.plot([], [], linestyle="--", color="orange")
+    t["put"] = ax.axhline(0, color='red', linestyle="--", linewidth=2)
+    t["company"] = ax.text(0.5, 1.05, "", transform=ax.transAxes, ha='center', fontsize=9)
+    simplify_xaxis(ax)
+    ax.grid(True)
+    return t
+
+def create_hedge_chart(dates, prices, trade, bands=None, fmt="png", dpi=None):
+    window, width = trade["bollinger_window"], trade["bollinger_width"]
+    hedge_put_price = trade["hedge_put_price"]
+    t = template("hedge")
+    ax = t["ax"]
+    ax.xaxis.update_units(dates)
+    x = date_numbers(dates)
+    t["price"].set_data(x, prices)
+    if len(prices) >= window:
+        _, upper, lower = bands or bollinger_bands(prices, window, width)
+        show_line(t["upper"], x[window-1:], upper, "Upper Bollinger")
+        show_line(t["lower"], x[window-1:], lower, "Lower Bollinger")
+    else:
+        hide_line(t["upper"])
+        hide_line(t["lower"])
+    set_level(t["put"], hedge_put_price, f"Hedge Put (${hedge_put_price})")
+    t["company"].set_text("Hedge Company: " + trade["hedge_name"])
+    rescale(ax)
+    set_legend(t, ax, fontsize=7)
+    return render(t["fig"], fmt, dpi, tight=True)
+
+def _build_bollinger():
+    fig = new_figure((8.27, 5.85))
+    ax = fig.subplots()
+    t = {"fig": fig, "ax": ax}
+    t["price"], = ax.plot([], [], label='Price', linewidth=1.5)
+    t["upper"], = ax.plot([], [], linestyle="--", color="blue")
+    t["lower"], = ax.plot([], [], linestyle="--", color="orange")
+    t["short_call"] = ax.axhline(0, color='red', linestyle='--', linewidth=2)
+    t["long_call"] = ax.axhline(0, color='green', linestyle='--', linewidth=2)
+    t["title"] = ax.set_title("")
+    t["note"] = ax.text(0.01, 0.97, "", transform=ax.transAxes, ha='left', va='top', fontsize=8, style='italic')
+    simplify_xaxis(ax)
+    ax.grid(True)
+    return t
+
+def create_bollinger_chart(dates, prices, trade, bands=None, fmt="png", dpi=None):
+    window, width = trade["bollinger_window"], trade["bollinger_width"]
+    short_call, long_call = trade["short_call"], trade["long_call"]
+    t = template("bollinger")
+    ax = t["ax"]
+    ax.xaxis.update_units(dates)
+    x = date_numbers(dates)
+    t["price"].set_data(x, prices)
+    y_min, y_max = min(np.min(prices), short_call, long_call), max(np.max(prices), short_call, long_call)
+    if len(prices) >= window:
+        _, upper, lower = bands or bollinger_bands(prices, window, width)
+        show_line(t["upper"], x[window-1:], upper, "Upper Bollinger")
+        show_line(t["lower"], x[window-1:], lower, "Lower Bollinger")
+        y_min, y_max = min(y_min, lower.min()), max(y_max, upper.max())
+    else:
+        hide_line(t["upper"])
+        hide_line(t["lower"])
+    set_level(t["short_call"], short_call, f'Short Call (${short_call})')
+    set_level(t["long_call"], long_call, f'Long Call (${long_call})')
+    padding = (y_max - y_min) * 0.1
+    rescale(ax, scaley=False)
+    ax.set_ylim(y_min - padding, y_max + padding)
+    t["title"].set_text(f"{trade['stock_name']} Bollinger Bands")
+    t["note"].set_text(f"Bands {window}-day MA - {width} Standard Deviations")
+    set_legend(t, ax, fontsize=7)
+    return render(t["fig"], fmt, dpi, tight=True)
+
+def crossover_segments(x, y, idx):
+    segments = np.empty((len(idx), 2, 2))
+    segments[:, 0, 0] = x[idx - 2]
+    segments[:, 1, 0] = x[idx]
+    segments[:, :, 1] = y[idx, None]
+    return segments
+
+def _build_macd():
+    fig = new_figure((8.27, 5.85))
+    ax1, ax2 = fig.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': [2, 1]})
+    t = {"fig": fig, "ax1": ax1, "ax2": ax2}
+
+    # --- Top Panel: Price + Call Lines + Markers ---
+    t["price"], = ax1.plot([], [], label='Price', color='black', linewidth=1.5)
+    t["short_call"] = ax1.axhline(0, color='red', linestyle='--', linewidth=2)
+    t["long_call"] = ax1.axhline(0, color='green', linestyle='--', linewidth=2)
+    # Divergence (green) and convergence (red) markers, one collection per panel
+    t["price_marks"] = ax1.add_collection(LineCollection([], linewidths=4))
+
+    # --- Bottom Panel: MACD + Signal ---
+    t["macd_marks"] = ax2.add_collection(LineCollection([], linewidths=4))
+    t["macd"], = ax2.plot([], [], label='MACD', color='blue', linewidth=1.5)
+    t["signal"], = ax2.plot([], [], label='Signal', color='red', linestyle='--', linewidth=1.5)
+
+    t["title"] = ax1.set_title("", fontsize=9)
+    ax1.grid(True)
+    ax2.grid(True)
+    simplify_xaxis(ax2)
+    return t
+
+def create_macd_chart(dates, prices, trade, lines=None, fmt="png", dpi=None):
+    fast, slow, signal_span = trade["macd_fast"], trade["macd_slow"], trade["macd_signal"]
+    short_call, long_call = trade["short_call"], trade["long_call"]
+
+    # Calculate EMAs; the plot starts once the slow EMA and the signal line
+    # have warmed up and needs at least two points after that
+    if len(prices) < slow + signal_span:
+        raise ValueError(f"Not enough data for MACD ({len(prices)} bars, {fast}/{slow}/{signal_span} needs "
+                         f"{slow + signal_span})")
+
+    t = template("macd")
+    ax1, ax2 = t["ax1"], t["ax2"]
+    macd, signal = lines or macd_lines(prices, fast, slow, signal_span)[:2]
+    bullish, bearish = crossovers(macd, signal)
+
+    # Drop the EMA warm-up bars
+    aligned_len = len(prices) - (slow - 1) - (signal_span - 1)
+    offset = len(prices) - aligned_len
+    macd_values = macd[offset:]
+    signal_values = signal[offset:]
+    price_values = prices[offset:]
+    macd_dates = dates[offset:]
+
+    ax1.xaxis.update_units(macd_dates)
+    x = date_numbers(macd_dates)
+    t["price"].set_data(x, price_values)
+    set_level(t["short_call"], short_call, f'Short Call (${short_call})')
+    set_level(t["long_call"], long_call, f'Long Call (${long_call})')
+    idx = np.concatenate((bullish, bearish)) - offset
+    keep = idx >= 2
+    idx = idx[keep]
+    colors = np.array(['green'] * len(bullish) + ['red'] * len(bearish))[keep]
+    t["price_marks"].set_segments(crossover_segments(x, price_values, idx))
+    t["price_marks"].set_color(colors)
+    t["macd_marks"].set_segments(crossover_segments(x, macd_values, idx))
+    t["macd_marks"].set_color(colors)
+    t["macd"].set_data(x, macd_values)
+    t["signal"].set_data(x, signal_values)
+
+    # Auto-scale
+    rescale(ax1, scaley=False)
+    price_padding = (price_values.max() - price_values.min()) * 0.1
+    ax1.set_ylim(price_values.min() - price_padding, price_values.max() + price_padding)
+
+    lo = min(macd_values.min(), signal_values.min())
+    hi = max(macd_values.max(), signal_values.max())
+    macd_padding = (hi - lo) * 0.1 if hi > lo else 1
+    ax2.set_ylim(lo - macd_padding, hi + macd_padding)
+
+    t["title"].set_text(f"{trade['stock_name']} Bear Call Spread Report - MACD Chart")
+    set_legend(t, ax2, fontsize=8)
+    return render(t["fig"], fmt, dpi, tight=True)
+
+_builders = {
+    "pl": _build_pl,
+    "hedge": _build_hedge,
+    "bollinger": _build_bollinger,
+    "macd": _build_macd,
+}
+
+# --- Parallel rendering ---
+def _pool_context():
+    # fork hands the already-loaded arrays and imports to the workers without
+    # re-running the calling script, which spawn would do.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+def _timed_job(fn, args, fmt, dpi):
+    start = time.perf_counter()
+    chart = fn(*args, fmt=fmt, dpi=dpi)
+    return chart, time.perf_counter() - start
+
+def render_charts(jobs, workers=None, fmt="png", dpi=None):
+    # jobs: list of (create_* function, args); returns the charts in job order.
+    # Each chart's render time is recorded under the function's name.
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    results = None
+    if workers > 1 and len(jobs) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+                futures = [pool.submit(_timed_job, fn, args, fmt, dpi) for fn, args in jobs]
+                results = [f.result() for f in futures]
+        except (ImportError, NotImplementedError, OSError, BrokenProcessPool) as e:
+            print(f"Parallel chart rendering unavailable, rendering serially: {e}")
+    if results is None:
+        results = [_timed_job(fn, args, fmt, dpi) for fn, args in jobs]
+    for (fn, _), (_, seconds) in zip(jobs, results):
+        timing.record(fn.__name__, seconds)
+    return [chart for chart, _ in results]
@@ -0,0 +1,249 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+# python -m trading <command>. Each command imports only what its path
+# needs: data and indicators load numpy and the price store, report loads
+# reportlab, and matplotlib only once charts are rendered (never with
+# --table-only).
+
+def load(symbols, args, betas=True):
+    from trading.data import load_many
+    return load_many(symbols, betas=betas, offline=args.offline)
+
+def cmd_data(args):
+    for symbol, (name, _, dates, prices, beta) in load(args.symbols, args, betas=not args.no_beta).items():
+        if len(prices):
+            print(f"{symbol:6} {name}: {len(prices)} bars {dates[0]} to {dates[-1]}, last {prices[-1]:.2f}, beta {beta}")
+        else:
+            print(f"{symbol:6} {name}: no history")
+
+def cmd_sources(args):
+    # Latency and error stats the history races have recorded so far
+    from trading.data import history_sources
+    print(history_sources.report())
+
+def cmd_indicators(args):
+    from trading.indicators import bollinger_bands, macd, crossovers
+    symbol = args.symbol.upper()
+    name, _, dates, prices, _ = load([symbol], args, betas=False)[symbol]
+    if len(prices) < max(args.window, args.slow + args.signal):
+        raise SystemExit(f"Not enough history for {symbol} ({len(prices)} bars)")
+    ma, upper, lower = bollinger_bands(prices, args.window, args.width)
+    line, signal, hist = macd(prices, args.fast, args.slow, args.signal)
+    bullish, bearish = crossovers(line, signal)
+    print(f"{symbol} {name} as of {dates[-1]}: close {prices[-1]:.2f}")
+    print(f"Bollinger {args.window}/{args.width:g}: mid {ma[-1]:.2f}, upper {upper[-1]:.2f}, lower {lower[-1]:.2f}")
+    print(f"MACD {args.fast}/{args.slow}/{args.signal}: {line[-1]:.3f}, signal {signal[-1]:.3f}, hist {hist[-1]:+.3f}")
+    last = max([(i, "bullish") for i in bullish[-1:]] + [(i, "bearish") for i in bearish[-1:]], default=None)
+    if last is not None:
+        print(f"Last crossover: {last[1]} on {dates[last[0]]}")
+
+def cmd_report(args):
+    from trading.batch import parse_position, report_filename
+    from trading import report
+    trade = {}
+    if args.trade:
+        with open(args.trade, "r", encoding="utf-8") as f:
+            trade.update(json.load(f))
+    for field in args.fields:
+        key, sep, value = field.partition("=")
+        if not sep:
+            raise SystemExit(f"Expected field=value, got {field!r}")
+        trade[key] = value
+    trade = parse_position(trade, "Trade")
+    session = None
+    if args.timings or args.profile or args.memory:
+        from trading.timing import Session
+        session = Session(args.profile, args.memory, label=f"report {trade['stock_symbol']}").start()
+    data = load([trade["stock_symbol"], trade["hedge_symbol"]], args)
+    stock_name, _, stock_dates, stock_prices, stock_beta = data[trade["stock_symbol"]]
+    hedge_name, _, hedge_dates, hedge_prices, hedge_beta = data[trade["hedge_symbol"]]
+    trade.update(stock_name=stock_name, stock_beta=stock_beta, hedge_name=hedge_name, hedge_beta=hedge_beta)
+    filename = args.out or report_filename(trade)
+    report.generate_pdf(trade, stock_dates, stock_prices, hedge_dates, hedge_prices, filename,
+                        chart_format=args.charts, chart_dpi=args.dpi, table_only=args.table_only)
+    print(filename)
+    if session is not None:
+        from trading.timing import report_path
+        print(session.stop().write(report_path(filename)))
+
+def cmd_scan(args):
+    from trading import price_store
+    from trading import scanner
+    root = args.store
+    if args.sim:
+        price_store.ensure_store()
+        root = price_store.sim_store_dir
+    start = time.perf_counter()
+    symbols, names, dates, closes = scanner.load_panel(args.symbols or None, root, args.bars)
+    loaded = time.perf_counter()
+    result = scanner.scan(closes, args.window, args.width, args.fast, args.slow, args.signal, args.lookback)
+    rows = scanner.rank_candidates(result, args.min_pct_b, args.top)
+    done = time.perf_counter()
+    as_of = dates[-1] if len(dates) else "n/a"
+    print(scanner.format_table(symbols, names, result, rows, as_of))
+    print(f"{int(result['valid'].sum())} of {len(symbols)} symbols scanned: "
+          f"load {(loaded - start) * 1000:.0f}ms, indicators {(done - loaded) * 1000:.0f}ms")
+    if args.csv:
+        scanner.write_csv(args.csv, symbols, names, result, rows)
+
+def cmd_strikes(args):
+    from datetime import datetime
+    import numpy as np
+    from trading import strikes
+    from trading.pricing import historical_volatility, days_per_year
+    symbol = args.symbol.upper()
+    years = None
+    vol = args.vol
+    spot = args.spot
+    json_chain = args.chain is not None and args.chain.lower().endswith(".json")
+    if not json_chain or args.expiration:
+        _, _, dates, prices, _ = load([symbol], args, betas=False)[symbol]
+        if len(prices) < 3:
+            raise SystemExit(f"Not enough history for {symbol} ({len(prices)} bars)")
+        spot = spot if spot is not None else float(prices[-1])
+        if vol is None:
+            vol = historical_volatility(prices)
+        if args.expiration:
+            expiry = np.datetime64(datetime.strptime(args.expiration, "%d/%m/%y").date(), "D")
+            years = max(int((expiry - dates[-1].astype("datetime64[D]")) // np.timedelta64(1, "D")), 0) / days_per_year
+    if years is None and not json_chain:
+        years = args.days / days_per_year
+    try:
+        if args.chain:
+            chain = strikes.load_chain(args.chain, symbol, spot, years)
+        else:
+            chain = strikes.synthetic_chain(symbol, spot, years, vol, args.rate)
+        front, evaluated = strikes.optimize(chain, vol, args.rate, args.pop, tuple(args.objectives), paths=args.paths,
+                                            fill=args.fill, max_width=args.max_width)
+    except (ValueError, KeyError) as e:
+        raise SystemExit(f"{args.chain or symbol}: {e}")
+    print(strikes.format_table(chain, front, evaluated, args.top))
+
+# --- Startup benchmark ---
+startup_targets = {
+    "import trading.data": "import trading.data",
+    "import trading.indicators": "import trading.indicators",
+    "import trading.report": "import trading.report",
+    "import trading.charts": "import trading.charts",
+}
+
+def _time_import(statement):
+    code = (f"import sys, time; t = time.perf_counter(); {statement}; t = time.perf_counter() - t; "
+            f"print(t, 'matplotlib' in sys.modules, 'reportlab' in sys.modules, 'ssl' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+    return float(out[0]), out[1:]
+
+def _time_command(argv):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "trading"] + argv, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+def cmd_startup(args):
+    # Medians over fresh interpreters; command timings include the work itself
+    print(f"{'':32} {'median':>8}  matplotlib reportlab  ssl")
+    for label, statement in startup_targets.items():
+        runs = [_time_import(statement) for _ in range(args.repeat)]
+        median = sorted(t for t, _ in runs)[len(runs) // 2]
+        print(f"{label:32} {median * 1000:6.0f}ms  " + " ".join(f"{flag:>9}" for flag in runs[0][1]))
+    stock, hedge = args.stock.upper(), args.hedge.upper()
+    trade = [f"stock_symbol={stock}", f"hedge_symbol={hedge}"] + args.fields
+    commands = {
+        f"data {stock}": ["data", "--offline", "--no-beta", stock],
+        f"indicators {stock}": ["indicators", "--offline", stock],
+        "report --table-only": ["report", "--offline", "--table-only", "-o", args.scratch] + trade,
+        "report": ["report", "--offline", "-o", args.scratch] + trade,
+    }
+    for label, argv in commands.items():
+        median = sorted(_time_command(argv) for _ in range(args.repeat))[args.repeat // 2]
+        print(f"{label:32} {median * 1000:6.0f}ms")
+    if os.path.exists(args.scratch):
+        os.remove(args.scratch)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m trading", description="Bear call spread reports and market data")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("data", help="load and summarise price history")
+    p.add_argument("symbols", nargs="+")
+    p.add_argument("--no-beta", action="store_true", help="skip the beta lookup")
+    p.add_argument("--offline", action="store_true", help="price store and Sim Data only, no requests")
+    p.set_defaults(run=cmd_data)
+
+    p = commands.add_parser("sources", help="per-source latency and error stats from the history races")
+    p.set_defaults(run=cmd_sources)
+
+    p = commands.add_parser("indicators", help="latest Bollinger and MACD values for a symbol")
+    p.add_argument("symbol")
+    p.add_argument("--window", type=int, default=20)
+    p.add_argument("--width", type=float, default=2.0)
+    p.add_argument("--fast", type=int, default=12)
+    p.add_argument("--slow", type=int, default=26)
+    p.add_argument("--signal", type=int, default=9)
+    p.add_argument("--offline", action="store_true", help="price store and Sim Data only, no requests")
+    p.set_defaults(run=cmd_indicators)
+
+    p = commands.add_parser("report", help="generate a report PDF")
+    p.add_argument("fields", nargs="*", help="trade inputs as name=value (Version 53 input names)")
+    p.add_argument("--trade", help="JSON file with the trade inputs")
+    p.add_argument("-o", "--out", help="output PDF (default: generated from the trade)")
+    p.add_argument("--table-only", action="store_true", help="trade table and simulation only, no charts")
+    p.add_argument("--charts", choices=("vector", "png"), default="vector")
+    p.add_argument("--dpi", type=int, default=None, help="PNG chart resolution")
+    p.add_argument("--offline", action="store_true", help="price store and Sim Data only, no requests")
+    p.add_argument("--timings", action="store_true", help="write stage timings as JSON next to the PDF")
+    p.add_argument("--profile", action="store_true", help="add cProfile hot spots (and a .prof file) to the timings")
+    p.add_argument("--memory", action="store_true", help="add tracemalloc peaks per stage to the timings")
+    p.set_defaults(run=cmd_report)
+
+    p = commands.add_parser("scan", help="rank bear call spread candidates across the price store")
+    p.add_argument("symbols", nargs="*", help="symbols to scan (default: every symbol in the store)")
+    p.add_argument("--store", default=None, help="price store folder (default: Price Store)")
+    p.add_argument("--sim", action="store_true", help="scan the Sim Data store")
+    p.add_argument("--bars", type=int, default=250, help="closes per symbol")
+    p.add_argument("--window", type=int, default=20)
+    p.add_argument("--width", type=float, default=2.0)
+    p.add_argument("--fast", type=int, default=12)
+    p.add_argument("--slow", type=int, default=26)
+    p.add_argument("--signal", type=int, default=9)
+    p.add_argument("--lookback", type=int, default=3, help="bars since the bearish MACD crossover")
+    p.add_argument("--min-pct-b", type=float, default=0.8, help="minimum Bollinger %%B (1 = upper band)")
+    p.add_argument("--top", type=int, default=25)
+    p.add_argument("--csv", help="also write the candidates to this CSV")
+    p.set_defaults(run=cmd_scan)
+
+    p = commands.add_parser("strikes", help="Pareto-efficient short/long call strikes from an options chain")
+    p.add_argument("symbol")
+    p.add_argument("--chain", help="chain JSON or CSV (default: a Black-Scholes stand-in around the last close)")
+    p.add_argument("--expiration", help="DD/MM/YY, counted from the last close")
+    p.add_argument("--days", type=float, default=30, help="days to expiry without --expiration (JSON chains carry their own)")
+    p.add_argument("--spot", type=float, default=None, help="underlying price (default: chain or last close)")
+    p.add_argument("--vol", type=float, default=None, help="volatility (default: historical, or the chain iv for JSON chains)")
+    p.add_argument("--rate", type=float, default=0.04)
+    p.add_argument("--pop", choices=("bs", "mc"), default="bs", help="probability of profit model")
+    p.add_argument("--paths", type=int, default=100_000, help="Monte Carlo paths")
+    p.add_argument("--fill", choices=("natural", "mid"), default="natural")
+    p.add_argument("--max-width", type=float, default=None, help="widest spread considered")
+    p.add_argument("--objectives", nargs=2, default=["risk_reward", "pop"],
+                   choices=("risk_reward", "pop", "credit"), help="the two values maximised together")
+    p.add_argument("--top", type=int, default=None, help="print only the first TOP efficient pairs")
+    p.add_argument("--offline", action="store_true", help="price store and Sim Data only, no requests")
+    p.set_defaults(run=cmd_strikes)
+
+    p = commands.add_parser("startup", help="benchmark import and command start-up times")
+    p.add_argument("--stock", default="AAPL")
+    p.add_argument("--hedge", default="TSLA")
+    p.add_argument("-n", "--repeat", type=int, default=5)
+    p.add_argument("--scratch", default="startup-bench.pdf", help="report written by the command timings")
+    p.add_argument("--fields", nargs="*", default=["short_call=216", "long_call=220", "premium=2.5",
+                                                  "hedge_put_price=250", "expiration=28/06/25",
+                                                  "target_price=215", "mc_paths=0"])
+    p.set_defaults(run=cmd_startup)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+    return 0
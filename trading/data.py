@@ -0,0 +1,237 @@
+import io
+import os
+import json
+import re
+import time
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from trading import price_store
+from trading.cache import cache
+from trading.ingest import read_csv_history
+from trading.ingest import read_json_history
+from trading.sources import Registry, hedge_delay
+from trading.timing import stage, timed
+
+fmp_key = "i5nShJm6WKlPcM5h5iKlSaTY0ThnH8xA"
+fmp_base = "https://financialmodelingprep.com"
+yahoo_base = "https://finance.yahoo.com"
+stooq_base = "https://stooq.com"
+yahoo_download_base = "https://query1.finance.yahoo.com"
+fetch_deadline = 10
+history_days = 365
+
+def _body(result):
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+def _history_job(symbol, since=None):
+    # A full year for symbols we have never stored, otherwise just the bars
+    # from the last stored date on (re-fetching that bar picks up revisions).
+    span = f"timeseries={history_days}" if since is None else f"from={since}"
+    return f"{fmp_base}/api/v3/historical-price-full/{symbol}?serietype=line&{span}&apikey={fmp_key}", {}
+
+def _profile_job(symbol):
+    return f"{fmp_base}/api/v3/profile/{symbol}?apikey={fmp_key}", {}
+
+def _beta_job(symbol):
+    from trading import fetch
+    return f"{yahoo_base}/quote/{symbol}/key-statistics", {"context": fetch.unverified_context()}
+
+def _sync_history(symbol, entry, history_result, profile_result):
+    # Rows are streamed from the body into arrays, no list of dicts in between
+    history = read_json_history(io.BytesIO(_body(history_result)))
+    if history is None:
+        dates, prices = np.array([], dtype="datetime64[D]"), np.array([])
+    else:
+        _, dates, prices = history
+    name = None
+    if entry is None:
+        if not len(dates):
+            raise ValueError("empty history")
+        profile = json.loads(_body(profile_result))
+        name = profile[0]["companyName"] if profile and "companyName" in profile[0] else symbol
+    with _store_lock:
+        price_store.merge_symbol(symbol, dates, prices, name, root=price_store.store_dir)
+        return price_store.load_symbol(symbol, price_store.store_dir)
+
+# Syncs of different symbols run in parallel and share the store index
+_store_lock = threading.Lock()
+
+def _parse_beta(result):
+    html = _body(result).decode('utf-8')
+    match = re.search(r'Beta \(5Y Monthly\)</span></td><td[^>]*><span[^>]*>([^<]+)</span>', html)
+    if match:
+        return match.group(1).strip()
+    return "N/A"
+
+def load_stored(symbol, sim_data_path=price_store.sim_data_path, store_dir=price_store.sim_store_dir):
+    try:
+        price_store.ensure_store(sim_data_path, store_dir)
+        stored = price_store.load_symbol(symbol, store_dir)
+        if stored is not None:
+            return stored
+    except Exception as e:
+        print(f"Sim Data fallback error: {e}")
+    return symbol, 100.0, np.array([], dtype="datetime64[D]"), np.array([])
+
+def _cache_key(job):
+    symbol, endpoint = job
+    return ("yahoo" if endpoint == "beta" else "fmp", symbol, endpoint)
+
+# --- History sources ---
+# Raced per symbol by load_many (see trading.sources). FMP is synced into
+# the price store; Stooq and Yahoo serve the last history_days of closes as
+# they are. The last stored history and Sim Data are the fallbacks.
+def _fmp_history(symbol, timeout):
+    from trading import fetch
+    entry = price_store.load_index(price_store.store_dir).get(symbol)
+    jobs = {"history": _history_job(symbol, None if entry is None else entry["last"])}
+    profile = None
+    if entry is None:
+        profile = cache.get(_cache_key((symbol, "profile")))
+        if profile is None:
+            jobs["profile"] = _profile_job(symbol)
+    results = fetch.fetch_all(jobs, timeout)
+    history = _sync_history(symbol, entry, results["history"], results.get("profile", profile))
+    if "profile" in jobs:
+        cache.put(_cache_key((symbol, "profile")), results["profile"])
+    return history
+
+def _csv_history(symbol, url, timeout):
+    from trading import fetch
+    dates, closes = read_csv_history(io.BytesIO(fetch.pool.get(url, timeout=timeout)))
+    if not len(dates):
+        return None
+    keep = dates > dates[-1] - np.timedelta64(history_days, "D")
+    entry = price_store.load_index(price_store.store_dir).get(symbol)
+    name = entry["companyName"] if entry else symbol
+    return name, float(closes[-1]), dates[keep], closes[keep]
+
+def _stooq_history(symbol, timeout):
+    return _csv_history(symbol, f"{stooq_base}/q/d/l/?s={symbol.lower()}.us&i=d", timeout)
+
+def _yahoo_history(symbol, timeout):
+    end = int(time.time())
+    start = end - history_days * 86400
+    return _csv_history(symbol, f"{yahoo_download_base}/v7/finance/download/{symbol}?period1={start}"
+                                f"&period2={end}&interval=1d&events=history", timeout)
+
+def _stored_history(symbol, timeout):
+    return price_store.load_symbol(symbol, price_store.store_dir)
+
+def _has_history(history):
+    return history is not None and len(history[2]) > 0
+
+# Stats live with the cache, so runs on a scratch cache (watch --feed,
+# tests) keep them out of the real one
+history_sources = Registry(lambda: os.path.join(cache.root, "sources.json"))
+history_sources.register("fmp", _fmp_history, priority=0)
+history_sources.register("stooq", _stooq_history, priority=1)
+history_sources.register("yahoo", _yahoo_history, priority=2)
+history_sources.register("store", _stored_history, priority=0, fallback=True)
+history_sources.register("sim", lambda symbol, timeout: load_stored(symbol), priority=1, fallback=True)
+offline_sources = ("store", "sim")
+# Live sources raced by load_many, None for every registered one
+live_sources = None
+# Symbols raced at once (as fetch.fetch_all's workers). With more stale
+# symbols than this (bulk loads such as batch) sources are not hedged on a
+# timer, only on failure, so a slow vendor does not triple the requests.
+race_workers = 16
+
+def _race_history(symbol, names, end, hedge):
+    # end: the monotonic deadline shared by every race in the load
+    try:
+        name, history = history_sources.race(symbol, names, max(0.0, end - time.monotonic()), hedge, _has_history)
+    except LookupError as e:
+        print(e)
+        return symbol, 100.0, np.array([], dtype="datetime64[D]"), np.array([])
+    if history_sources.sources[name].fallback and names != offline_sources:
+        print(f"No live history for {symbol}, using {name}")
+    return history
+
+@timed()
+def load_many(symbols, betas=True, deadline=None, use_cache=True, offline=False):
+    # One concurrent round for everything that is not fresh on disk: a
+    # history race per symbol not synced within the history TTL (FMP
+    # incremental or full history plus profile, Stooq, Yahoo, then the
+    # stored history or Sim Data), alongside the betas not in the cache.
+    # Returns {symbol: (name, price, dates, prices, beta)}. offline skips the
+    # requests and serves the store, Sim Data and cached betas only.
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    index = price_store.load_index(price_store.store_dir)
+    now = time.time()
+    deadline = fetch_deadline if deadline is None else deadline
+    jobs, cached, stale = {}, {}, []
+    for symbol in symbols:
+        entry = index.get(symbol)
+        if entry is None or not use_cache or now - entry.get("synced", 0) > cache.ttls["history"]:
+            stale.append(symbol)
+        if betas:
+            job = (symbol, "beta")
+            payload = cache.get(_cache_key(job)) if use_cache else None
+            if payload is not None:
+                cached[job] = payload
+            elif not offline:
+                jobs[job] = _beta_job(symbol)
+    if offline:
+        names = offline_sources
+    else:
+        names = None if live_sources is None else tuple(live_sources) + offline_sources
+    histories, results = {}, {}
+    if stale or jobs:
+        with stage("fetch"):
+            end = time.monotonic() + deadline
+            hedge = deadline if len(stale) > race_workers else hedge_delay
+            executor = ThreadPoolExecutor(max_workers=max(1, min(len(stale), race_workers)))
+            try:
+                races = {symbol: executor.submit(_race_history, symbol, names, end, hedge) for symbol in stale}
+                # The HTTP/SSL stack is only imported when something has to be fetched
+                if jobs:
+                    from trading import fetch
+                    results = fetch.fetch_all(jobs, deadline)
+                histories = {symbol: race.result() for symbol, race in races.items()}
+            finally:
+                executor.shutdown(wait=False)
+    loaded = {}
+    for symbol in symbols:
+        history = histories.get(symbol)
+        if history is None:
+            history = price_store.load_symbol(symbol, price_store.store_dir)
+        if history is None:
+            history = load_stored(symbol)
+        beta = "N/A"
+        if betas:
+            beta_job = (symbol, "beta")
+            try:
+                if beta_job in cached:
+                    beta = cached[beta_job].decode()
+                elif beta_job in results:
+                    beta = _parse_beta(results[beta_job])
+                    if use_cache and beta != "N/A":
+                        cache.put(_cache_key(beta_job), beta.encode())
+            except Exception as e:
+                print(f"Beta fetch error for {symbol}: {e}")
+        loaded[symbol] = tuple(history) + (beta,)
+    return loaded
+
+@timed()
+def load_historical(symbol):
+    return load_many([symbol], betas=False)[symbol.upper()][:4]
+
+@timed()
+def fetch_beta(symbol):
+    key = _cache_key((symbol, "beta"))
+    payload = cache.get(key)
+    if payload is not None:
+        return payload.decode()
+    from trading import fetch
+    try:
+        beta = _parse_beta(fetch.fetch_all({symbol: _beta_job(symbol)}, fetch_deadline)[symbol])
+        if beta != "N/A":
+            cache.put(key, beta.encode())
+        return beta
+    except Exception as e:
+        print(f"Beta fetch error for {symbol}: {e}")
+    return "N/A"
@@ -0,0 +1,151 @@
+import re
+import json
+import time
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from trading import price_store
+from trading import data
+
+# Local stand-in for the FMP and Yahoo endpoints used by trading.data, served
+# over HTTP/1.1 keep-alive from Sim Data. Point the loaders at it with
+# use_feed(base_url), e.g. to exercise concurrency, deadlines and connection
+# reuse without network access.
+
+def load_feed(path=price_store.sim_data_path):
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        entries = json.load(f)
+    feed = {}
+    for entry in entries:
+        feed[entry["symbol"].upper()] = {
+            "companyName": entry["companyName"],
+            # FMP returns newest bar first
+            "historical": sorted(entry["historical"], key=lambda d: d["date"], reverse=True),
+            "beta": entry.get("beta", "1.00"),
+        }
+    return feed
+
+def hold_back(feed, bars):
+    # Remove the newest `bars` closes per symbol so release() can replay them
+    # as new bars: {symbol: [rows, oldest first]}
+    pending = {}
+    for symbol, entry in feed.items():
+        pending[symbol] = entry["historical"][:bars][::-1]
+        entry["historical"] = entry["historical"][bars:]
+    return pending
+
+def release(server, pending, bars=1):
+    # Publish the next held-back bars; returns {symbol: rows released}
+    released = {}
+    with server.lock:
+        for symbol, rows in pending.items():
+            rows_out, pending[symbol] = rows[:bars], rows[bars:]
+            if rows_out:
+                entry = server.feed[symbol]
+                entry["historical"] = rows_out[::-1] + entry["historical"]
+                released[symbol] = rows_out
+    return released
+
+def history_slice(entry, params):
+    rows = entry["historical"]
+    if "from" in params:
+        rows = [d for d in rows if d["date"] >= params["from"]]
+    if "to" in params:
+        rows = [d for d in rows if d["date"] <= params["to"]]
+    if "timeseries" in params:
+        rows = rows[:int(params["timeseries"])]
+    return rows
+
+class FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active, self.server.active)
+        try:
+            self.respond()
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+    def respond(self):
+        path, _, query = self.path.partition("?")
+        params = dict(urllib.parse.parse_qsl(query))
+        delay = self.server.delays.get(path, self.server.delay)
+        if delay:
+            time.sleep(delay)
+        match = re.fullmatch(r"/api/v3/historical-price-full/([^/]+)", path)
+        if match:
+            entry = self.server.feed.get(match.group(1).upper())
+            body = {"symbol": match.group(1), "historical": history_slice(entry, params)} if entry else {}
+            return self.send(json.dumps(body).encode(), "application/json")
+        match = re.fullmatch(r"/api/v3/profile/([^/]+)", path)
+        if match:
+            entry = self.server.feed.get(match.group(1).upper())
+            body = [{"symbol": match.group(1), "companyName": entry["companyName"]}] if entry else []
+            return self.send(json.dumps(body).encode(), "application/json")
+        match = re.fullmatch(r"/quote/([^/]+)/key-statistics", path)
+        if match and match.group(1).upper() in self.server.feed:
+            beta = self.server.feed[match.group(1).upper()]["beta"]
+            html = f'<tr><td><span>Beta (5Y Monthly)</span></td><td class="v"><span class="v">{beta}</span></td></tr>'
+            return self.send(html.encode(), "text/html; charset=utf-8")
+        self.send(b"not found", "text/plain", 404)
+
+    def send(self, body, content_type, status=200):
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on a delayed response
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+def start(feed=None, delay=0.0, delays=None, host="127.0.0.1", port=0):
+    # delays: {path: seconds} overrides the default per-request delay
+    server = ThreadingHTTPServer((host, port), FeedHandler)
+    server.daemon_threads = True
+    server.feed = load_feed() if feed is None else feed
+    server.delay = delay
+    server.delays = delays or {}
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+    # Requests in flight now and at most at once
+    server.active = 0
+    server.max_active = 0
+    server.bytes_sent = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def use_feed(base_url):
+    # Only the FMP and Yahoo quote endpoints are served here. The Stooq and
+    # Yahoo downloads point at the feed as well (and 404), and the history
+    # race is limited to FMP so no real vendor can stand in for the replay.
+    data.fmp_base = base_url
+    data.yahoo_base = base_url
+    data.stooq_base = base_url
+    data.yahoo_download_base = base_url
+    data.live_sources = ("fmp",)
+
+if __name__ == "__main__":
+    import sys
+    server, base_url = start(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print(f"Serving {', '.join(sorted(server.feed))} at {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
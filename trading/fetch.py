@@ -0,0 +1,110 @@
+import ssl
+import time
+import threading
+import http.client
+import urllib.error
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait
+
+default_headers = {"User-Agent": "Mozilla/5.0", "Connection": "keep-alive"}
+stale_errors = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+# --- Keep-alive connection pool ---
+class ConnectionPool:
+    def __init__(self, max_idle=8):
+        self.max_idle = max_idle
+        self.created = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _take(self, key, timeout, context):
+        scheme, host = key[:2]
+        with self._lock:
+            conns = self._idle.get(key)
+            conn = conns.pop() if conns else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        with self._lock:
+            self.created += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, timeout=timeout, context=context), False
+        return http.client.HTTPConnection(host, timeout=timeout), False
+
+    def _give(self, key, conn):
+        with self._lock:
+            conns = self._idle.setdefault(key, [])
+            if len(conns) < self.max_idle:
+                conns.append(conn)
+                return
+        conn.close()
+
+    def get(self, url, timeout=10, headers=None, context=None):
+        parts = urllib.parse.urlsplit(url)
+        path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        key = (parts.scheme, parts.netloc, id(context))
+        headers = dict(default_headers, **(headers or {}))
+        while True:
+            conn, reused = self._take(key, timeout, context)
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except stale_errors:
+                conn.close()
+                if reused:
+                    # The server dropped an idle keep-alive connection; retry on a fresh one.
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                self._give(key, conn)
+            if response.status >= 400:
+                raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+            return body
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+pool = ConnectionPool()
+_unverified_context = None
+
+def unverified_context():
+    # Built on first use so importing this module stays cheap
+    global _unverified_context
+    if _unverified_context is None:
+        _unverified_context = ssl._create_unverified_context()
+    return _unverified_context
+
+# --- Concurrent fetch ---
+def fetch_all(jobs, deadline=10, workers=16):
+    # jobs: {key: (url, get() kwargs)}. Every request shares one deadline; the
+    # result for each key is the response body or the exception it raised.
+    results = {}
+    if not jobs:
+        return results
+    end = time.monotonic() + deadline
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(jobs)))
+    try:
+        futures = {executor.submit(pool.get, url, **dict({"timeout": deadline}, **kwargs)): key
+                   for key, (url, kwargs) in jobs.items()}
+        done, pending = wait(futures, timeout=max(0.0, end - time.monotonic()))
+        for future in done:
+            error = future.exception()
+            results[futures[future]] = error if error is not None else future.result()
+        for future in pending:
+            future.cancel()
+            results[futures[future]] = TimeoutError(f"no response within {deadline}s")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
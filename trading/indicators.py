@@ -0,0 +1,283 @@
+import numpy as np
+
+# The batch functions work along the last axis, so a 2-D (symbols x dates)
+# array is processed in one pass.
+
+# --- Bollinger Bands ---
+rolling_chunk = 1 << 16
+
+def _rolling_mean_std(prices, window):
+    # Centre each chunk on its own mean so the running sums stay small and the
+    # sum-of-squares formula does not lose precision on long, trending series.
+    centre = prices.mean(axis=-1, keepdims=True)
+    x = prices - centre
+    zeros = np.zeros(x.shape[:-1] + (1,))
+    s1 = np.concatenate((zeros, np.cumsum(x, axis=-1)), axis=-1)
+    s2 = np.concatenate((zeros, np.cumsum(x * x, axis=-1)), axis=-1)
+    n = prices.shape[-1] - window + 1
+    mean = (s1[..., window:] - s1[..., :n]) / window
+    var = np.maximum((s2[..., window:] - s2[..., :n]) / window - mean * mean, 0.0)
+    return mean + centre, np.sqrt(var)
+
+def rolling_mean_std(prices, window):
+    prices = np.asarray(prices, dtype=np.float64)
+    n = prices.shape[-1] - window + 1
+    if window < 1 or n < 1:
+        return np.empty(prices.shape[:-1] + (0,)), np.empty(prices.shape[:-1] + (0,))
+    mean = np.empty(prices.shape[:-1] + (n,))
+    std = np.empty(prices.shape[:-1] + (n,))
+    for start in range(0, n, rolling_chunk):
+        stop = min(start + rolling_chunk, n)
+        mean[..., start:stop], std[..., start:stop] = _rolling_mean_std(prices[..., start:stop + window - 1], window)
+    return mean, std
+
+def bollinger_bands(prices, window=20, num_std=2.0):
+    ma, std = rolling_mean_std(prices, window)
+    return ma, ma + num_std * std, ma - num_std * std
+
+# --- MACD ---
+def ema(prices, span):
+    x = np.asarray(prices, dtype=np.float64)
+    out = np.empty(x.shape)
+    if x.shape[-1] == 0:
+        return out
+    alpha = 2.0 / (span + 1)
+    decay = 1.0 - alpha
+    if decay <= 0:
+        out[...] = x
+        return out
+    # Inside a block y[t] = decay * y[t-1] + alpha * x[t] unrolls to
+    #   y[j] = decay**(j+1) * y_prev + alpha * decay**j * cumsum(x[k] * decay**-k)
+    # so each block is one vectorized pass; blocks are sized to keep
+    # decay**-k well inside float range.
+    block = max(1, int(np.log(1e100) / -np.log(decay)))
+    powers = decay ** np.arange(block + 1)
+    inverse = 1.0 / powers[:-1]
+    prev = x[..., :1]
+    for start in range(0, x.shape[-1], block):
+        seg = x[..., start:start + block]
+        m = seg.shape[-1]
+        acc = np.cumsum(seg * inverse[:m], axis=-1)
+        out[..., start:start + m] = powers[1:m + 1] * prev + alpha * powers[:m] * acc
+        prev = out[..., start + m - 1:start + m]
+    return out
+
+def macd(prices, fast=12, slow=26, signal=9):
+    macd_line = ema(prices, fast) - ema(prices, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+def crossovers(a, b):
+    bullish, bearish = crossover_masks(a, b)
+    return np.flatnonzero(bullish), np.flatnonzero(bearish)
+
+def crossover_masks(a, b):
+    # Boolean arrays shaped like a: True on the bar a moves above (bullish)
+    # or below (bearish) b
+    a = np.asarray(a)
+    b = np.asarray(b)
+    above = a > b
+    below = a < b
+    bullish = np.zeros(above.shape, dtype=bool)
+    bearish = np.zeros(below.shape, dtype=bool)
+    bullish[..., 1:] = above[..., 1:] & ~above[..., :-1]
+    bearish[..., 1:] = below[..., 1:] & ~below[..., :-1]
+    return bullish, bearish
+
+# --- Incremental indicators ---
+# O(1)-per-bar state for live updates and scanning. from_history() seeds the
+# state from the same data the batch functions above use, so update()
+# continues their series (equal to rounding). revise() replaces the latest
+# value, e.g. an intraday close, instead of adding a bar.
+class RollingStats:
+    # Rolling mean and population variance over `window` values (Welford
+    # updates: each bar adds one value and drops the oldest)
+    __slots__ = ("window", "values", "head", "count", "mean", "m2")
+
+    def __init__(self, window):
+        self.window = window
+        self.values = [0.0] * window
+        self.head = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @classmethod
+    def from_history(cls, prices, window):
+        stats = cls(window)
+        tail = np.asarray(prices, dtype=np.float64)[-window:]
+        stats.values[:len(tail)] = tail.tolist()
+        stats.count = len(tail)
+        if len(tail):
+            stats.mean = float(tail.mean())
+            stats.m2 = float(np.square(tail - stats.mean).sum())
+        return stats
+
+    def _replace(self, old, x):
+        mean = self.mean + (x - old) / self.count
+        self.m2 += (x - old) * (x - mean + old - self.mean)
+        self.mean = mean
+
+    def update(self, x):
+        x = float(x)
+        if self.count < self.window:
+            self.values[self.count] = x
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+        else:
+            old = self.values[self.head]
+            self.values[self.head] = x
+            self.head = (self.head + 1) % self.window
+            self._replace(old, x)
+        return self
+
+    def revise(self, x):
+        x = float(x)
+        last = (self.head - 1) % self.window if self.count == self.window else self.count - 1
+        old = self.values[last]
+        self.values[last] = x
+        self._replace(old, x)
+        return self
+
+    @property
+    def ready(self):
+        return self.count == self.window
+
+    @property
+    def variance(self):
+        return max(self.m2, 0.0) / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+class BollingerBands:
+    __slots__ = ("stats", "num_std")
+
+    def __init__(self, window=20, num_std=2.0):
+        self.stats = RollingStats(window)
+        self.num_std = num_std
+
+    @classmethod
+    def from_history(cls, prices, window=20, num_std=2.0):
+        bands = cls(window, num_std)
+        bands.stats = RollingStats.from_history(prices, window)
+        return bands
+
+    @property
+    def value(self):
+        # (ma, upper, lower), or None until the window is full
+        if not self.stats.ready:
+            return None
+        ma, width = self.stats.mean, self.num_std * self.stats.std
+        return ma, ma + width, ma - width
+
+    def update(self, price):
+        self.stats.update(price)
+        return self.value
+
+    def revise(self, price):
+        self.stats.revise(price)
+        return self.value
+
+class EMA:
+    # Seeded with the first value like ema()
+    __slots__ = ("alpha", "value", "previous")
+
+    def __init__(self, span):
+        self.alpha = min(2.0 / (span + 1), 1.0)
+        self.value = None
+        self.previous = None
+
+    @classmethod
+    def from_history(cls, prices, span):
+        average = cls(span)
+        values = ema(prices, span)
+        if len(values):
+            average.value = float(values[-1])
+        if len(values) > 1:
+            average.previous = float(values[-2])
+        return average
+
+    def _step(self, base, x):
+        return float(x) if base is None else base + self.alpha * (x - base)
+
+    def update(self, x):
+        self.previous = self.value
+        self.value = self._step(self.previous, x)
+        return self.value
+
+    def revise(self, x):
+        self.value = self._step(self.previous, x)
+        return self.value
+
+class MACD:
+    __slots__ = ("fast", "slow", "signal")
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    @classmethod
+    def from_history(cls, prices, fast=12, slow=26, signal=9):
+        state = cls(fast, slow, signal)
+        state.fast = EMA.from_history(prices, fast)
+        state.slow = EMA.from_history(prices, slow)
+        state.signal = EMA.from_history(ema(prices, fast) - ema(prices, slow), signal)
+        return state
+
+    @property
+    def value(self):
+        # (macd, signal, histogram), or None before the first bar
+        if self.signal.value is None:
+            return None
+        line = self.fast.value - self.slow.value
+        return line, self.signal.value, line - self.signal.value
+
+    def update(self, price):
+        self.signal.update(self.fast.update(price) - self.slow.update(price))
+        return self.value
+
+    def revise(self, price):
+        self.signal.revise(self.fast.revise(price) - self.slow.revise(price))
+        return self.value
+
+class Crossover:
+    # Same rule as crossovers(): +1 on the bar a moves above b, -1 on the bar
+    # it moves below, else 0
+    __slots__ = ("above", "below", "previous", "last")
+
+    def __init__(self):
+        self.above = None
+        self.below = None
+        self.previous = (None, None)
+        self.last = 0
+
+    @classmethod
+    def from_history(cls, a, b):
+        detector = cls()
+        a, b = np.asarray(a), np.asarray(b)
+        for x, y in zip(a[-2:], b[-2:]):
+            detector.update(x, y)
+        return detector
+
+    def _step(self, state, a, b):
+        was_above, was_below = state
+        above, below = bool(a > b), bool(a < b)
+        if was_above is None:
+            signal = 0
+        else:
+            signal = 1 if above and not was_above else -1 if below and not was_below else 0
+        return above, below, signal
+
+    def update(self, a, b):
+        self.previous = (self.above, self.below)
+        self.above, self.below, self.last = self._step(self.previous, a, b)
+        return self.last
+
+    def revise(self, a, b):
+        self.above, self.below, self.last = self._step(self.previous, a, b)
+        return self.last
@@ -0,0 +1,305 @@
+import io
+import re
+import csv
+import json
+import codecs
+import numpy as np
+
+# Streaming readers for price history files and responses. Rows go straight
+# into growable date/close arrays, so memory follows the rows kept, not the
+# size of the file: a multi-symbol dump is read one entry (JSON) or line
+# (CSV) at a time and other symbols' rows are dropped as they are read.
+# Dates come back as datetime64[D] in ascending order.
+read_size = 1 << 16
+date_block = 4096
+# Characters kept ahead of the JSON fast path; longer values take the slow one
+margin = 4096
+_whitespace = re.compile(r"[ \t\r\n]*").match
+_runs = {"[": re.compile(r'(?:[^"\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*').match,
+         "{": re.compile(r'(?:[^"{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*').match}
+
+# --- Columns ---
+class Columns:
+    # Preallocated date/close arrays that double when full. Date strings are
+    # parsed a block at a time; rows with unparseable dates are dropped.
+    def __init__(self, capacity=4096):
+        self.dates = np.empty(capacity, dtype="datetime64[D]")
+        self.closes = np.empty(capacity)
+        self.size = 0
+        self.pending = []
+
+    def _grow(self, needed):
+        capacity = max(needed, 2 * len(self.closes))
+        for name in ("dates", "closes"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def _flush(self):
+        try:
+            dates = np.array([d for d, _ in self.pending], dtype="datetime64[D]")
+            closes = [c for _, c in self.pending]
+        except ValueError:
+            # Drop the rows whose dates do not parse
+            dates, closes = [], []
+            for d, c in self.pending:
+                try:
+                    dates.append(np.datetime64(d, "D"))
+                    closes.append(c)
+                except ValueError:
+                    continue
+        n = len(closes)
+        if self.size + n > len(self.closes):
+            self._grow(self.size + n)
+        self.dates[self.size:self.size + n] = dates
+        self.closes[self.size:self.size + n] = closes
+        self.size += n
+        self.pending = []
+
+    def add(self, date, close):
+        self.pending.append((date, close))
+        if len(self.pending) == date_block:
+            self._flush()
+
+    def arrays(self):
+        if self.pending:
+            self._flush()
+        dates, closes = self.dates[:self.size], self.closes[:self.size]
+        if self.size > 1 and (dates[1:] < dates[:-1]).any():
+            order = np.argsort(dates, kind="stable")
+            dates, closes = dates[order], closes[order]
+        return dates.copy(), closes.copy()
+
+# --- JSON ---
+class _JsonStream:
+    # Just enough of an incremental JSON reader for arrays of objects: values
+    # are decoded one at a time from a buffer refilled from the file
+    def __init__(self, f):
+        self.f = f
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self.json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, ahead=read_size):
+        # Make sure `ahead` characters (or the rest of the file) follow pos
+        while not self.eof and len(self.buffer) - self.pos < ahead:
+            chunk = self.f.read(read_size)
+            if not chunk:
+                self.eof = True
+                self.buffer = self.buffer[self.pos:] + self.decoder.decode(b"", final=True)
+            elif isinstance(chunk, bytes):
+                self.buffer = self.buffer[self.pos:] + self.decoder.decode(chunk)
+            else:
+                self.buffer = self.buffer[self.pos:] + chunk
+            self.pos = 0
+
+    def peek(self):
+        while True:
+            self._fill(1)
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                return ""
+
+    def take(self, expected):
+        ch = self.peek()
+        if ch not in expected:
+            raise ValueError(f"Expected {expected!r} in JSON, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        # One complete value. The read-ahead keeps numbers from being cut at
+        # the end of the buffer; larger values are retried with more input.
+        self.peek()
+        ahead = read_size
+        while True:
+            self._fill(ahead)
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                ahead *= 2
+                continue
+            self.pos = end
+            return value
+
+    def values(self):
+        # Decode the elements of an array in turn. Whole runs of objects in
+        # the buffer are decoded in one call, cut at the last "}," before
+        # the first "]" (so the run stays inside this array; a cut inside an
+        # element leaves a bracket or string open and fails to parse). After
+        # a failed cut, or without one, elements go one at a time until the
+        # buffer is refilled, and those at the end of the buffer through
+        # value()/take().
+        self.take("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        decode = self.json.raw_decode
+        failed = None
+        while True:
+            if len(self.buffer) - self.pos < margin and not self.eof:
+                self._fill()
+            buffer = self.buffer
+            pos = _whitespace(buffer, self.pos).end()
+            if buffer is not failed:
+                close = buffer.find("]", pos)
+                cut = buffer.rfind("},", pos, len(buffer) if close < 0 else close)
+                if cut > pos:
+                    try:
+                        batch = json.loads("[" + buffer[pos:cut + 1] + "]")
+                    except json.JSONDecodeError:
+                        failed = buffer
+                    else:
+                        self.pos = cut + 2
+                        yield from batch
+                        continue
+            try:
+                value, end = decode(buffer, pos)
+                end = _whitespace(buffer, end).end()
+                ch = buffer[end]
+            except (json.JSONDecodeError, IndexError):
+                self.pos = pos
+                value = self.value()
+                ch = self.take(",]")
+            else:
+                if ch not in ",]":
+                    raise ValueError(f"Expected ',]' in JSON, got {ch!r}")
+                self.pos = end + 1
+            yield value
+            if ch == "]":
+                return
+
+    def skip(self):
+        # Step over one array or object without decoding it: a regex runs
+        # over everything but strings and its own kind of bracket, so only
+        # those brackets are counted
+        opening = self.peek()
+        if opening not in "[{":
+            self.value()
+            return
+        run = _runs[opening]
+        depth = 0
+        while True:
+            end = run(self.buffer, self.pos).end()
+            if end == len(self.buffer) or self.buffer[end] == '"':
+                # Out of input, or a string that runs past the buffer
+                if self.eof:
+                    raise ValueError("Unterminated JSON value")
+                self.pos = end
+                self._fill(len(self.buffer) - end + read_size)
+                continue
+            self.pos = end + 1
+            depth += 1 if self.buffer[end] == opening else -1
+            if depth == 0:
+                return
+
+    def items(self):
+        # Iterate an array; the caller consumes each element
+        self.take("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.take(",]") == "]":
+                return
+
+def _read_entry(stream, symbols, date_key, close_key):
+    # One history object. Scalars are kept as fields, the "historical" array
+    # is read row by row; rows of unwanted symbols are skipped once the
+    # symbol is known.
+    fields = {}
+    columns = None
+    stream.take("{")
+    if stream.peek() == "}":
+        stream.pos += 1
+        return fields, None
+    while True:
+        key = stream.value()
+        stream.take(":")
+        if key == "historical" and stream.peek() == "[":
+            wanted = symbols is None or "symbol" not in fields or str(fields["symbol"]).upper() in symbols
+            if not wanted:
+                stream.skip()
+            else:
+                columns = Columns()
+                for row in stream.values():
+                    try:
+                        columns.add(row[date_key][:10], float(row[close_key]))
+                    except (KeyError, TypeError, ValueError):
+                        continue
+        else:
+            fields[key] = stream.value()
+        if stream.take(",}") == "}":
+            return fields, columns
+
+def iter_json_histories(f, symbols=None, date_key="date", close_key="close"):
+    # f: text or binary file holding one history object (an FMP response) or
+    # a list of them (Sim Data). Yields (fields, dates, closes) per entry
+    # with a "historical" array, restricted to `symbols` if given; fields
+    # holds the other top-level values (symbol, companyName, price, ...).
+    stream = _JsonStream(f)
+    symbols = None if symbols is None else {s.upper() for s in symbols}
+
+    def read():
+        fields, columns = _read_entry(stream, symbols, date_key, close_key)
+        if columns is None:
+            return None
+        if symbols is not None and str(fields.get("symbol", "")).upper() not in symbols:
+            return None
+        return (fields,) + columns.arrays()
+
+    if stream.peek() == "[":
+        for _ in stream.items():
+            if stream.peek() != "{":
+                stream.value()
+                continue
+            entry = read()
+            if entry is not None:
+                yield entry
+    elif stream.peek() == "{":
+        entry = read()
+        if entry is not None:
+            yield entry
+
+def read_json_history(f, symbol=None):
+    # The first (or `symbol`'s) history in f, or None
+    for entry in iter_json_histories(f, None if symbol is None else [symbol]):
+        return entry
+    return None
+
+# --- CSV ---
+def read_csv_history(f, date_column="Date", close_column="Close", symbol_column=None, symbol=None):
+    # Chunked CSV reader: f is a text or binary file (e.g. an HTTP response)
+    # read line by line. Rows with unparseable values are skipped; with
+    # symbol_column only `symbol`'s rows are kept. Returns (dates, closes).
+    if not isinstance(f, io.TextIOBase):
+        f = io.TextIOWrapper(f, encoding="utf-8", errors="replace", newline="")
+    reader = csv.reader(f)
+    header = [h.strip() for h in next(reader, [])]
+    try:
+        date_at, close_at = header.index(date_column), header.index(close_column)
+        symbol_at = header.index(symbol_column) if symbol_column else None
+    except ValueError:
+        raise ValueError(f"CSV header {header} has no {date_column}/{close_column} column")
+    symbol = symbol.upper() if symbol else None
+    columns = Columns()
+    for row in reader:
+        try:
+            if symbol_at is not None and row[symbol_at].strip().upper() != symbol:
+                continue
+            date = row[date_at].strip()[:10]
+            if len(date) != 10:
+                continue
+            columns.add(date, float(row[close_at]))
+        except (IndexError, ValueError):
+            continue
+    return columns.arrays()
@@ -0,0 +1,152 @@
+import os
+import time
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from trading.payoff import bear_call_spread, long_put, combine, position_pnl
+from trading.pricing import black_scholes, days_per_year
+
+trading_days_per_year = 252
+
+# --- Model ---
+# A model is a plain dict so it can be shipped to worker processes:
+#   spots (2,)            stock and hedge closes at the start
+#   steps                 trading days to expiry
+#   method                "gbm" (correlated GBM) or "bootstrap" (resampled joint daily log returns)
+#   drift, chol           per-step log drift (2,) and Cholesky factor of the step covariance (gbm)
+#   returns (n, 2)        historical joint daily log returns (bootstrap)
+#   legs                  payoff legs; position 0 is the spread, position 1 the hedge put
+#   barriers              [(underlying, level, +1 up / -1 down)] for touch probabilities
+
+def joint_log_returns(stock_dates, stock_prices, hedge_dates, hedge_prices):
+    _, ia, ib = np.intersect1d(np.asarray(stock_dates, dtype="datetime64[D]"),
+                               np.asarray(hedge_dates, dtype="datetime64[D]"), return_indices=True)
+    closes = np.column_stack((np.asarray(stock_prices, dtype=np.float64)[ia],
+                              np.asarray(hedge_prices, dtype=np.float64)[ib]))
+    return np.diff(np.log(closes), axis=0)
+
+def build_model(trade, stock_dates, stock_prices, hedge_dates, hedge_prices, method="gbm"):
+    returns = joint_log_returns(stock_dates, stock_prices, hedge_dates, hedge_prices)
+    if len(returns) < 2:
+        raise ValueError("Not enough overlapping history for Monte Carlo")
+    spots = np.array([stock_prices[-1], hedge_prices[-1]], dtype=np.float64)
+    days = trade["days_to_expiry"]
+    steps = max(1, int(round(days * trading_days_per_year / days_per_year)))
+    dt = 1.0 / trading_days_per_year
+    rate = trade.get("risk_free_rate", 0.0)
+    contracts = trade.get("contract_size", 1)
+
+    # Annualised vols from the trade (as priced) or the history, correlation from the history
+    vols = np.array([trade.get("volatility") or np.nan, trade.get("hedge_volatility") or np.nan])
+    vols = np.where(np.isfinite(vols), vols, returns.std(axis=0, ddof=1) * np.sqrt(trading_days_per_year))
+    corr = np.corrcoef(returns.T)[0, 1] if returns.std(axis=0).all() else 0.0
+    cov = np.outer(vols, vols) * np.array([[1.0, corr], [corr, 1.0]]) * dt
+
+    # The hedge put costs its Black-Scholes value unless a premium was given
+    hedge_premium = trade.get("hedge_premium")
+    if hedge_premium is None:
+        hedge_premium = float(black_scholes(-1, spots[1], trade["hedge_put_price"], days / days_per_year, vols[1], rate)["price"])
+    legs = combine(
+        bear_call_spread(trade["short_call"], trade["long_call"], trade["premium"], contracts, underlying=0, position=0),
+        long_put(trade["hedge_put_price"], hedge_premium, contracts, underlying=1, position=1),
+    )
+    return {
+        "spots": spots,
+        "steps": steps,
+        "method": method,
+        "drift": (rate - 0.5 * vols ** 2) * dt,
+        "chol": np.linalg.cholesky(cov + np.eye(2) * 1e-18),
+        "returns": returns,
+        "legs": legs,
+        "barriers": [(0, float(trade["short_call"]), 1), (1, float(trade["hedge_put_price"]), -1)],
+        "hedge_premium": hedge_premium,
+    }
+
+# --- Simulation ---
+def _simulate_chunk(model, n, rng):
+    steps = model["steps"]
+    if model["method"] == "bootstrap":
+        returns = model["returns"]
+        increments = returns[rng.integers(0, len(returns), size=(n, steps))]
+    else:
+        increments = rng.standard_normal((n, steps, 2)) @ model["chol"].T
+        increments += model["drift"]
+    log_paths = np.cumsum(increments, axis=1)
+    final = model["spots"] * np.exp(log_paths[:, -1])
+    touched = []
+    for underlying, level, direction in model["barriers"]:
+        # Paths start at log-spot 0, so a barrier at or through spot is touched
+        threshold = np.log(level / model["spots"][underlying])
+        if direction > 0:
+            touched.append(np.count_nonzero(np.maximum(log_paths[:, :, underlying].max(axis=1), 0.0) >= threshold))
+        else:
+            touched.append(np.count_nonzero(np.minimum(log_paths[:, :, underlying].min(axis=1), 0.0) <= threshold))
+    pnl = position_pnl(model["legs"], final)
+    pnl = np.column_stack((pnl[:, 0], pnl.sum(axis=1)))
+    return {
+        "paths": n,
+        "pnl_sum": pnl.sum(axis=0),
+        "pnl_sq_sum": np.square(pnl).sum(axis=0),
+        "wins": np.count_nonzero(pnl > 0, axis=0),
+        "touches": np.array(touched),
+    }
+
+def _merge(totals, part):
+    if totals is None:
+        return part
+    return {k: totals[k] + part[k] for k in totals}
+
+def _run_shard(model, paths, chunk, seed):
+    # Memory is bounded by chunk * steps * 2 doubles regardless of paths
+    rng = np.random.default_rng(seed)
+    totals = None
+    for start in range(0, paths, chunk):
+        totals = _merge(totals, _simulate_chunk(model, min(chunk, paths - start), rng))
+    return totals
+
+def simulate(model, paths=100_000, chunk=20_000, workers=1, seed=None):
+    started = time.perf_counter()
+    workers = max(1, min(workers or os.cpu_count() or 1, paths // chunk or 1))
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    shares = [paths // workers + (1 if i < paths % workers else 0) for i in range(workers)]
+    totals = None
+    if workers > 1:
+        try:
+            ctx = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                futures = [pool.submit(_run_shard, model, n, chunk, s) for n, s in zip(shares, seeds)]
+                for future in futures:
+                    totals = _merge(totals, future.result())
+        except (ImportError, NotImplementedError, OSError, BrokenProcessPool) as e:
+            print(f"Parallel simulation unavailable, running serially: {e}")
+            totals = None
+    if totals is None:
+        for n, s in zip(shares, seeds):
+            totals = _merge(totals, _run_shard(model, n, chunk, s))
+
+    n = totals["paths"]
+    mean = totals["pnl_sum"] / n
+    std = np.sqrt(np.maximum(totals["pnl_sq_sum"] / n - mean ** 2, 0.0))
+    wins = totals["wins"] / n
+    touches = totals["touches"] / n
+    return {
+        "paths": n,
+        "steps": model["steps"],
+        "method": model["method"],
+        "pop_spread": float(wins[0]),
+        "pop_combined": float(wins[1]),
+        "expected_spread": float(mean[0]),
+        "expected_combined": float(mean[1]),
+        "stderr_spread": float(std[0] / np.sqrt(n)),
+        "stderr_combined": float(std[1] / np.sqrt(n)),
+        "touch_short_call": float(touches[0]),
+        "touch_hedge_put": float(touches[1]),
+        "hedge_premium": model["hedge_premium"],
+        "elapsed": time.perf_counter() - started,
+    }
+
+def simulate_trade(trade, stock_dates, stock_prices, hedge_dates, hedge_prices, paths=100_000, method="gbm",
+                   workers=1, seed=None):
+    model = build_model(trade, stock_dates, stock_prices, hedge_dates, hedge_prices, method)
+    return simulate(model, paths, workers=workers, seed=seed)
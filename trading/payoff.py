@@ -0,0 +1,96 @@
+import numpy as np
+
+# --- Legs ---
+# A position (or a whole book) is a structured array of legs. kind is one of
+# kinds below, qty is signed (+ long / - short) in contracts, premium is per
+# share paid (long) or received (short), underlying indexes the price axis
+# and position groups legs for per-position P&L. For stock legs strike is
+# the entry price.
+kinds = {"call": 1, "put": -1, "stock": 0}
+multiplier = 100
+
+leg_dtype = np.dtype([
+    ("kind", "i1"),
+    ("strike", "f8"),
+    ("qty", "f8"),
+    ("premium", "f8"),
+    ("underlying", "i4"),
+    ("position", "i4"),
+])
+
+def make_legs(rows):
+    # rows: iterable of (kind, strike, qty, premium[, underlying[, position]])
+    out = []
+    for row in rows:
+        kind, strike, qty, premium, *rest = row
+        underlying = rest[0] if len(rest) > 0 else 0
+        position = rest[1] if len(rest) > 1 else 0
+        out.append((kinds[kind] if isinstance(kind, str) else kind, strike, qty, premium, underlying, position))
+    return np.array(out, dtype=leg_dtype)
+
+def bear_call_spread(short_call, long_call, premium, contracts=1, underlying=0, position=0):
+    # premium is the net credit, booked on the short leg
+    return make_legs([
+        ("call", short_call, -contracts, premium, underlying, position),
+        ("call", long_call, contracts, 0.0, underlying, position),
+    ])
+
+def long_put(strike, premium, contracts=1, underlying=0, position=0):
+    return make_legs([("put", strike, contracts, premium, underlying, position)])
+
+def combine(*groups):
+    return np.concatenate(groups)
+
+# --- Expiry P&L ---
+def leg_pnl(legs, prices):
+    # prices: (...) for legs on a single underlying, else (..., n_underlyings).
+    # Returns (..., n_legs) expiry P&L in dollars.
+    prices = np.asarray(prices, dtype=np.float64)
+    n_underlyings = int(legs["underlying"].max(initial=0)) + 1
+    if n_underlyings == 1:
+        prices = prices[..., None]
+    elif prices.shape[-1:] != (n_underlyings,):
+        raise ValueError(f"prices must end in an axis of {n_underlyings} underlyings")
+    s = prices[..., legs["underlying"]]
+    k = legs["strike"]
+    kind = legs["kind"]
+    intrinsic = np.where(kind == 1, np.maximum(s - k, 0.0),
+                         np.where(kind == -1, np.maximum(k - s, 0.0), s - k))
+    return (intrinsic - legs["premium"]) * legs["qty"] * multiplier
+
+def expiry_pnl(legs, prices):
+    return leg_pnl(legs, prices).sum(axis=-1)
+
+def position_pnl(legs, prices):
+    # Per-position P&L for a book: (..., n_positions) via one matrix product
+    ids, inverse = np.unique(legs["position"], return_inverse=True)
+    membership = np.zeros((len(legs), len(ids)))
+    membership[np.arange(len(legs)), inverse] = 1.0
+    return leg_pnl(legs, prices) @ membership
+
+# --- Analytics ---
+def summary(legs):
+    # Expiry P&L is piecewise linear in the underlying with kinks at the
+    # strikes, so extremes and breakevens follow from the kink values and
+    # the slope beyond the last strike.
+    if len(np.unique(legs["underlying"])) > 1:
+        raise ValueError("summary needs legs on a single underlying")
+    points = np.unique(np.concatenate(([0.0], legs["strike"])))
+    values = expiry_pnl(legs, points)
+    upside = legs["kind"] != -1
+    slope = (legs["qty"][upside].sum()) * multiplier
+    max_profit = np.inf if slope > 0 else values.max()
+    max_loss = -np.inf if slope < 0 else values.min()
+
+    breakevens = list(points[values == 0])
+    a, b = values[:-1], values[1:]
+    crossing = np.flatnonzero((a * b) < 0)
+    x0, x1 = points[crossing], points[crossing + 1]
+    breakevens += list(x0 - a[crossing] * (x1 - x0) / (b[crossing] - a[crossing]))
+    if slope != 0 and values[-1] * slope < 0:
+        breakevens.append(points[-1] - values[-1] / slope)
+    return {
+        "max_profit": float(max_profit),
+        "max_loss": float(max_loss),
+        "breakevens": np.unique(breakevens),
+    }
@@ -0,0 +1,122 @@
+import os
+import json
+import time
+import numpy as np
+
+# --- Store layout ---
+# <store_dir>/index.json                  symbol -> companyName, price, length, last, synced, array files
+# <store_dir>/<SYMBOL>.dates.npy          datetime64[D], ascending, unique
+# <store_dir>/<SYMBOL>.closes.npy         float64, aligned with dates
+# Live FMP history is synced into store_dir; Sim Data is imported into its
+# own store so simulated bars never mix with real ones.
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sim_data_path = os.path.join(base_dir, "Sim Data.txt")
+store_dir = os.path.join(base_dir, "Price Store")
+sim_store_dir = os.path.join(store_dir, "Sim Data")
+
+_indexes = {}
+
+def index_path(root=store_dir):
+    return os.path.join(root, "index.json")
+
+def load_index(root=store_dir):
+    path = index_path(root)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    cached = _indexes.get(root)
+    if cached is None or cached[0] != mtime:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = (mtime, json.load(f))
+        _indexes[root] = cached
+    return cached[1]
+
+def save_index(index, root=store_dir):
+    path = index_path(root)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+def _save_array(root, filename, array):
+    tmp = os.path.join(root, filename + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, os.path.join(root, filename))
+
+def write_symbol(index, symbol, name, price, dates, closes, root=store_dir):
+    symbol = symbol.upper()
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    closes = np.asarray(closes, dtype=np.float64)
+    order = np.argsort(dates, kind="stable")
+    entry = {
+        "companyName": name,
+        "price": float(price),
+        "length": int(len(dates)),
+        "last": str(dates[order][-1]) if len(dates) else None,
+        "dates": f"{symbol}.dates.npy",
+        "closes": f"{symbol}.closes.npy",
+    }
+    _save_array(root, entry["dates"], dates[order])
+    _save_array(root, entry["closes"], closes[order])
+    index[symbol] = entry
+    return entry
+
+def merge_symbol(symbol, dates, closes, name=None, price=None, root=store_dir):
+    # Append bars to a stored symbol, de-duplicating on date (new bars win)
+    os.makedirs(root, exist_ok=True)
+    symbol = symbol.upper()
+    index = dict(load_index(root))
+    entry = index.get(symbol)
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    closes = np.asarray(closes, dtype=np.float64)
+    if entry is not None:
+        dates = np.concatenate((np.load(os.path.join(root, entry["dates"])), dates))
+        closes = np.concatenate((np.load(os.path.join(root, entry["closes"])), closes))
+        name = name or entry["companyName"]
+    order = np.argsort(dates, kind="stable")
+    dates, closes = dates[order], closes[order]
+    keep = np.append(dates[1:] != dates[:-1], True)
+    dates, closes = dates[keep], closes[keep]
+    if price is None:
+        price = closes[-1] if len(closes) else 0.0
+    write_symbol(index, symbol, name or symbol, price, dates, closes, root)
+    index[symbol]["synced"] = time.time()
+    save_index(index, root)
+    return index[symbol]
+
+def import_sim_data(path=sim_data_path, root=sim_store_dir):
+    # Streamed one symbol at a time, so the file size does not set peak memory
+    from trading.ingest import iter_json_histories
+    os.makedirs(root, exist_ok=True)
+    index = dict(load_index(root))
+    with open(path, "rb") as f:
+        for fields, dates, closes in iter_json_histories(f):
+            write_symbol(index, fields["symbol"], fields["companyName"], fields["price"], dates, closes, root)
+    save_index(index, root)
+    return sorted(index)
+
+def ensure_store(path=sim_data_path, root=sim_store_dir):
+    try:
+        if os.stat(index_path(root)).st_mtime >= os.stat(path).st_mtime:
+            return
+    except FileNotFoundError:
+        if not os.path.exists(path):
+            return
+    import_sim_data(path, root)
+
+def load_symbol(symbol, root=store_dir):
+    entry = load_index(root).get(symbol.upper())
+    if entry is None:
+        return None
+    dates = np.load(os.path.join(root, entry["dates"]), mmap_mode="r")
+    closes = np.load(os.path.join(root, entry["closes"]), mmap_mode="r")
+    return entry["companyName"], entry["price"], dates, closes
+
+if __name__ == "__main__":
+    import sys
+    src = sys.argv[1] if len(sys.argv) > 1 else sim_data_path
+    dst = sys.argv[2] if len(sys.argv) > 2 else sim_store_dir
+    symbols = import_sim_data(src, dst)
+    print(f"Imported {len(symbols)} symbols into {dst}: {', '.join(symbols)}")
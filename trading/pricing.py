@@ -0,0 +1,105 @@
+import numpy as np
+from trading.payoff import multiplier
+
+days_per_year = 365.0
+sqrt_2pi = np.sqrt(2 * np.pi)
+
+# --- Normal distribution ---
+def norm_pdf(x):
+    return np.exp(-0.5 * np.square(x)) / sqrt_2pi
+
+def norm_cdf(x):
+    # Hart's double precision approximation (West, 2005), vectorized
+    x = np.asarray(x, dtype=np.float64)
+    z = np.abs(x)
+    e = np.exp(-0.5 * z * z)
+    n = (((((0.0352624965998911 * z + 0.700383064443688) * z + 6.37396220353165) * z
+           + 33.912866078383) * z + 112.079291497871) * z + 221.213596169931) * z + 220.206867912376
+    d = ((((((0.0883883476483184 * z + 1.75566716318264) * z + 16.064177579207) * z
+            + 86.7807322029461) * z + 296.564248779674) * z + 637.333633378831) * z
+         + 793.826512519948) * z + 440.413735824752
+    near = e * n / d
+    zf = np.maximum(z, 1.0)
+    far = e / (zf + 1 / (zf + 2 / (zf + 3 / (zf + 4 / (zf + 0.65))))) / 2.506628274631
+    tail = np.where(z < 7.07106781186547, near, np.where(z < 37, far, 0.0))
+    return np.where(x > 0, 1.0 - tail, tail)
+
+# --- Black-Scholes ---
+def black_scholes(kind, spot, strike, expiry, vol, rate=0.0, div=0.0):
+    # kind: 1 call / -1 put (arrays broadcast together with every other
+    # input); expiry in years. Returns per-share price, delta, gamma, theta
+    # per calendar day and vega per 1 vol point. Expired options are priced
+    # at intrinsic with zero gamma/theta/vega.
+    kind, spot, strike, expiry, vol, rate, div = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in (kind, spot, strike, expiry, vol, rate, div)))
+    live = (expiry > 0) & (vol > 0)
+    t = np.where(live, expiry, 1.0)
+    v = np.where(live, vol, 1.0)
+    sqrt_t = np.sqrt(t)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(spot / strike) + (rate - div + 0.5 * v * v) * t) / (v * sqrt_t)
+    d1 = np.nan_to_num(d1, nan=0.0, posinf=50.0, neginf=-50.0)
+    d2 = d1 - v * sqrt_t
+    df_r = np.exp(-rate * t)
+    df_q = np.exp(-div * t)
+    nd1 = norm_cdf(kind * d1)
+    nd2 = norm_cdf(kind * d2)
+    pdf = norm_pdf(d1)
+    price = kind * (spot * df_q * nd1 - strike * df_r * nd2)
+    delta = kind * df_q * nd1
+    gamma = df_q * pdf / (spot * v * sqrt_t)
+    vega = spot * df_q * pdf * sqrt_t
+    theta = (-spot * df_q * pdf * v / (2 * sqrt_t)
+             - kind * rate * strike * df_r * nd2
+             + kind * div * spot * df_q * nd1)
+
+    intrinsic = np.maximum(kind * (spot - strike), 0.0)
+    expired_delta = np.where(kind * (spot - strike) > 0, kind, 0.0)
+    return {
+        "price": np.where(live, price, intrinsic),
+        "delta": np.where(live, delta, expired_delta),
+        "gamma": np.where(live, gamma, 0.0),
+        "theta": np.where(live, theta / days_per_year, 0.0),
+        "vega": np.where(live, vega / 100, 0.0),
+    }
+
+def historical_volatility(prices, window=60, periods_per_year=252):
+    prices = np.asarray(prices, dtype=np.float64)[-(window + 1):]
+    if len(prices) < 3:
+        return float("nan")
+    return float(np.std(np.diff(np.log(prices)), ddof=1) * np.sqrt(periods_per_year))
+
+# --- Legs ---
+# Same leg arrays as trading.payoff; spots and vols index by leg underlying
+# and every result is scaled by signed qty and the contract multiplier.
+def _leg_inputs(legs, spots, vols):
+    spots = np.asarray(spots, dtype=np.float64)
+    vols = np.asarray(vols, dtype=np.float64)
+    n_underlyings = int(legs["underlying"].max(initial=0)) + 1
+    if n_underlyings == 1:
+        spots = spots[..., None]
+        vols = vols[..., None]
+    return spots[..., legs["underlying"]], vols[..., legs["underlying"]]
+
+def leg_greeks(legs, spots, expiry, vols, rate=0.0):
+    s, v = _leg_inputs(legs, spots, vols)
+    expiry = np.asarray(expiry, dtype=np.float64)[..., None]
+    kind = legs["kind"].astype(np.float64)
+    option = legs["kind"] != 0
+    g = black_scholes(np.where(option, kind, 1.0), s, legs["strike"], expiry, v, rate)
+    scale = legs["qty"] * multiplier
+    greeks = {}
+    for name, values in g.items():
+        greeks[name] = values * scale
+    # stock legs: price is the spot, delta 1, no other greeks
+    greeks["price"] = np.where(option, greeks["price"], s * scale)
+    greeks["delta"] = np.where(option, greeks["delta"], scale)
+    for name in ("gamma", "theta", "vega"):
+        greeks[name] = np.where(option, greeks[name], 0.0)
+    return greeks
+
+def model_pnl(legs, prices, expiry, vols, rate=0.0):
+    # Mark-to-model P&L with `expiry` years left, (..., n_legs) like payoff.leg_pnl
+    value = leg_greeks(legs, prices, expiry, vols, rate)["price"]
+    cost = (legs["premium"] + np.where(legs["kind"] != 0, 0.0, legs["strike"])) * legs["qty"] * multiplier
+    return value - cost
@@ -0,0 +1,206 @@
+import numpy as np
+from io import BytesIO
+from datetime import datetime
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import A4
+from trading.payoff import bear_call_spread, long_put
+from trading.pricing import leg_greeks, historical_volatility, days_per_year
+from trading.timing import stage, timed
+
+# A trade is a dict keyed like the Version 53 inputs (stock_symbol,
+# hedge_symbol, short_call, long_call, premium, contract_size,
+# hedge_put_price, expiration, target_price) plus the looked-up
+# stock_name/hedge_name and stock_beta/hedge_beta. delta and hedge_delta are
+# only used when the legs cannot be priced from the price history.
+# matplotlib (charts) and the Monte Carlo module are imported on first use so
+# table-only reports never load them.
+trade_defaults = {
+    "contract_size": 1,
+    "volatility": None,
+    "hedge_volatility": None,
+    "vol_window": 60,
+    "risk_free_rate": 0.04,
+    "mc_paths": 100_000,
+    "mc_method": "gbm",
+    "mc_workers": 1,
+    "bollinger_window": 20,
+    "bollinger_width": 2,
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal": 9,
+}
+
+def risk_reward(trade):
+    premium = trade["premium"]
+    return round((premium * 100) / ((trade["long_call"] - trade["short_call"] - premium) * 100), 1)
+
+@timed()
+def price_trade(trade, stock_dates, stock_prices, hedge_dates, hedge_prices):
+    # Black-Scholes greeks for the spread and hedge put as of the last close.
+    # Volatility defaults to the historical volatility over vol_window bars.
+    if len(stock_prices) < 3:
+        return trade
+    as_of = np.datetime64(stock_dates[-1], "D")
+    expiry = np.datetime64(datetime.strptime(trade["expiration"], "%d/%m/%y").date(), "D")
+    days = max(int((expiry - as_of) // np.timedelta64(1, "D")), 0)
+    years = days / days_per_year
+    contracts = trade["contract_size"]
+    rate = trade["risk_free_rate"]
+    vol = trade["volatility"] or historical_volatility(stock_prices, trade["vol_window"])
+    spread = bear_call_spread(trade["short_call"], trade["long_call"], trade["premium"], contracts)
+    g = leg_greeks(spread, float(stock_prices[-1]), years, vol, rate)
+    priced = dict(trade, as_of=str(as_of), days_to_expiry=days, volatility=vol,
+                  delta=float(g["delta"].sum()) / (100 * contracts),
+                  spread_delta=float(g["delta"].sum()), spread_gamma=float(g["gamma"].sum()),
+                  spread_theta=float(g["theta"].sum()), spread_vega=float(g["vega"].sum()))
+    if len(hedge_prices) >= 3:
+        hedge_vol = trade["hedge_volatility"] or historical_volatility(hedge_prices, trade["vol_window"])
+        hg = leg_greeks(long_put(trade["hedge_put_price"], 0.0, contracts), float(hedge_prices[-1]), years, hedge_vol, rate)
+        priced.update(hedge_volatility=hedge_vol, hedge_delta=float(hg["delta"].sum()) / (100 * contracts))
+    return priced
+
+def _num(value):
+    return "N/A" if value is None else f"{value:.2f}"
+
+def draw_trade_table(c, width, height, trade):
+    premium, short_call, long_call = trade["premium"], trade["short_call"], trade["long_call"]
+    hedge_put_price, delta = trade["hedge_put_price"], trade.get("delta")
+    y_start = height * 0.9 - 10
+    c.setFont("Helvetica-Bold", 14)
+    table = {
+        "Stock": trade["stock_symbol"], "Delta": _num(delta), "Premium": f"${premium:.2f}",
+        "Target Price": f"${trade['target_price']:.2f}", "Short Call": f"${short_call:.2f}", "Long Call": f"${long_call:.2f}",
+        "Contract Size": trade["contract_size"], "Expiration": trade["expiration"], "Risk/Reward": risk_reward(trade),
+        "Hedge Stock": trade["hedge_symbol"], "Hedge Delta": _num(trade.get("hedge_delta")), "Hedge Put": f"${hedge_put_price:.2f}"
+    }
+    keys = list(table.keys())
+    values = list(table.values())
+    row_height = 17
+    col_width = width / 3
+    for row in range(4):
+        for col in range(3):
+            idx = row * 3 + col
+            if idx < len(keys):
+                c.drawString(col * col_width + 10, y_start - row * row_height, f"{keys[idx]}: {values[idx]}")
+    hedge_exposure = 100 * (hedge_put_price + premium)
+    call_risk = (long_call - short_call - premium) * 100
+    if "spread_delta" in trade:
+        delta_exposure = abs(trade["spread_delta"])
+    else:
+        delta_exposure = abs(delta or 0) * 100
+    c.drawString(10, y_start - 4 * row_height, f"Hedge Exposure: ${hedge_exposure:,.0f}")
+    c.drawString(col_width + 10, y_start - 4 * row_height, f"Call Spread Risk: ${call_risk:,.0f}")
+    c.drawString(col_width * 2 + 10, y_start - 4 * row_height, f"Net Prem ∆/$1: ±${delta_exposure:,.0f}")
+    c.setFont("Helvetica-Oblique", 9)
+    if "spread_theta" in trade:
+        c.drawString(col_width * 2 + 10, y_start - (4 * row_height + 12),
+                     f"* Theta ${trade['spread_theta']:+,.2f}/day  Vol {trade['volatility']:.0%}")
+    else:
+        c.drawString(col_width * 2 + 10, y_start - (4 * row_height + 12), "* ignoring theta")
+    c.setFont("Helvetica-Bold", 14)
+    y_beta = y_start - 5 * row_height
+    c.drawString(10, y_beta, f"{trade['stock_symbol']} {trade['stock_name']}  Beta: {trade['stock_beta']}")
+    c.drawString(10, y_beta - row_height, f"{trade['hedge_symbol']} {trade['hedge_name']}  Beta: {trade['hedge_beta']}")
+
+@timed()
+def simulate_report(trade, stock_dates, stock_prices, hedge_dates, hedge_prices):
+    if not trade["mc_paths"] or trade.get("days_to_expiry", 0) <= 0:
+        return None
+    from trading.montecarlo import simulate_trade
+    try:
+        return simulate_trade(trade, stock_dates, stock_prices, hedge_dates, hedge_prices,
+                              trade["mc_paths"], trade["mc_method"], trade["mc_workers"])
+    except ValueError as e:
+        print(f"Monte Carlo skipped: {e}")
+    return None
+
+def draw_simulation(c, width, height, sim):
+    y = height * 0.9 - 10 - 7 * 17
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(10, y, f"Monte Carlo ({sim['paths']:,} {sim['method'].upper()} paths, {sim['steps']} days):  "
+                        f"P(profit) {sim['pop_spread']:.0%}  E[P&L] ${sim['expected_spread']:,.0f}  "
+                        f"Touch Short Call {sim['touch_short_call']:.0%}")
+    c.drawString(10, y - 14, f"With hedge put (cost ${sim['hedge_premium']:.2f}):  "
+                             f"P(profit) {sim['pop_combined']:.0%}  E[P&L] ${sim['expected_combined']:,.0f}  "
+                             f"Touch Hedge Put {sim['touch_hedge_put']:.0%}")
+
+def draw_chart(c, chart, x, y, width, height):
+    # Fit the chart in the box without stretching, centred. PNG bytes are
+    # placed as an image, reportlab Drawings as vector paths.
+    if isinstance(chart, bytes):
+        from reportlab.lib.utils import ImageReader
+        c.drawImage(ImageReader(BytesIO(chart)), x, y, width=width, height=height, preserveAspectRatio=True, anchor="c")
+        return
+    from reportlab.graphics import renderPDF
+    scale = min(width / chart.width, height / chart.height)
+    c.saveState()
+    c.translate(x + (width - chart.width * scale) / 2, y + (height - chart.height * scale) / 2)
+    c.scale(scale, scale)
+    renderPDF.draw(chart, c, 0, 0)
+    c.restoreState()
+
+chart_names = ("pl", "hedge", "bollinger", "macd")
+
+@timed("charts")
+def render_report_charts(trade, stock_dates, stock_prices, hedge_dates, hedge_prices, names=chart_names,
+                         workers=None, fmt="vector", dpi=None, indicators=None):
+    # trade must be priced (price_trade) for the P&L curves. indicators may
+    # hold precomputed "stock_bands", "hedge_bands" and "macd" series.
+    with stage("import"):
+        from trading.charts import create_pl_chart, create_hedge_chart, create_bollinger_chart, create_macd_chart, render_charts
+    indicators = indicators or {}
+    jobs = {
+        "pl": (create_pl_chart, (trade,)),
+        "hedge": (create_hedge_chart, (hedge_dates, hedge_prices, trade, indicators.get("hedge_bands"))),
+        "bollinger": (create_bollinger_chart, (stock_dates, stock_prices, trade, indicators.get("stock_bands"))),
+        "macd": (create_macd_chart, (stock_dates, stock_prices, trade, indicators.get("macd"))),
+    }
+    return dict(zip(names, render_charts([jobs[name] for name in names], workers, fmt, dpi)))
+
+@timed()
+def generate_pdf(trade, stock_dates, stock_prices, hedge_dates, hedge_prices, filename, chart_workers=None,
+                 chart_format="vector", chart_dpi=None, table_only=False, charts=None, priced=None, sim=None):
+    # chart_format "vector" draws the charts as PDF paths and text, "png"
+    # embeds them as images at chart_dpi (figure dpi by default).
+    # table_only stops after the trade table and simulation. charts maps
+    # chart names to already rendered charts; only the others are rendered.
+    # priced is the trade as already priced by price_trade, with sim its
+    # simulate_report summary (None for none): both are used as they are.
+    if priced is None:
+        trade = price_trade(dict(trade_defaults, **trade), stock_dates, stock_prices, hedge_dates, hedge_prices)
+        sim = simulate_report(trade, stock_dates, stock_prices, hedge_dates, hedge_prices)
+    else:
+        trade = priced
+    c = canvas.Canvas(filename, pagesize=A4)
+    width, height = A4
+    with stage("draw_table"):
+        c.setFont("Helvetica-Bold", 16)
+        c.drawCentredString(width / 2, height * 0.95, f"{trade['stock_symbol']} - {trade['stock_name']} - Bear Call Spread Report")
+        c.setFont("Helvetica-Bold", 12)
+        c.drawCentredString(width / 2, height * 0.92, f"Hedging Stock: {trade['hedge_symbol']} - {trade['hedge_name']}")
+        draw_trade_table(c, width, height, trade)
+        if sim is not None:
+            draw_simulation(c, width, height, sim)
+    if table_only:
+        with stage("save"):
+            c.save()
+        return filename
+    charts = dict(charts or {})
+    missing = [name for name in chart_names if name not in charts]
+    if missing:
+        charts.update(render_report_charts(trade, stock_dates, stock_prices, hedge_dates, hedge_prices, missing,
+                                           chart_workers, chart_format, chart_dpi))
+    with stage("draw_charts"):
+        chart_height = height * 0.35
+        draw_chart(c, charts["pl"], 0, 0, width, chart_height)
+        draw_chart(c, charts["hedge"], 0, chart_height, width, chart_height)
+        c.showPage()
+        c.setFont("Helvetica-Bold", 14)
+        c.drawCentredString(width / 2, height - 10, "Stock Technical Indicators")
+        c.drawString(10, height - 30, "Bollinger Bands:")
+        draw_chart(c, charts["bollinger"], 0, height * 0.5, width, height * 0.5)
+        c.drawString(10, height * 0.5 - 20, "MACD:")
+        draw_chart(c, charts["macd"], 0, 0, width, height * 0.5)
+    with stage("save"):
+        c.save()
+    return filename
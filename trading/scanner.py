@@ -0,0 +1,104 @@
+import numpy as np
+from trading import price_store
+from trading.indicators import bollinger_bands, macd, crossover_masks
+
+# Bear call spread candidate scan over a whole price store. Every symbol's
+# recent closes go into one (symbols x dates) panel and the indicators run
+# once over the panel; the latest bar of each row is then scored.
+
+def load_panel(symbols=None, root=None, bars=250):
+    # Returns (symbols, names, dates, closes) with closes (n_symbols, bars)
+    # on the union of the symbols' last `bars` dates. Gaps are carried
+    # forward up to each symbol's last close; rows with no close at the
+    # start of the window, or whose store stopped updating (delisted, failed
+    # syncs), are NaN before the first and after the last.
+    root = root or price_store.store_dir
+    index = price_store.load_index(root)
+    symbols = sorted(index) if symbols is None else [s.upper() for s in symbols if s.upper() in index]
+    histories = []
+    for symbol in symbols:
+        _, _, dates, closes = price_store.load_symbol(symbol, root)
+        histories.append((dates[-bars:], closes[-bars:]))
+    if not histories:
+        return [], [], np.array([], dtype="datetime64[D]"), np.empty((0, 0))
+    dates = np.unique(np.concatenate([d for d, _ in histories]))[-bars:]
+    closes = np.full((len(symbols), len(dates)), np.nan)
+    last = np.full(len(symbols), -1)
+    for row, (d, c) in enumerate(histories):
+        keep = d >= dates[0]
+        closes[row, np.searchsorted(dates, d[keep])] = c[keep]
+        if keep.any():
+            last[row] = np.searchsorted(dates, d[-1])
+    # Forward fill along dates, but not past a symbol's last real close
+    filled = np.where(np.isnan(closes), 0, np.arange(len(dates)))
+    np.maximum.accumulate(filled, axis=1, out=filled)
+    closes = closes[np.arange(len(symbols))[:, None], filled]
+    closes[np.arange(len(dates)) > last[:, None]] = np.nan
+    names = [index[s].get("companyName", s) for s in symbols]
+    return symbols, names, dates, closes
+
+def scan(closes, window=20, num_std=2.0, fast=12, slow=26, signal=9, lookback=3):
+    # Latest-bar signals per row: close, bands, %B (0 lower band, 1 upper),
+    # MACD, signal, histogram and bars since the last bearish crossover
+    # (-1 if none in the window). Rows with gaps at the start are skipped,
+    # and so are stale rows (no close on the latest date), flagged as such.
+    complete = ~np.isnan(closes).any(axis=1)
+    n = len(closes)
+    close = closes[:, -1] if closes.shape[1] else np.full(n, np.nan)
+    result = {
+        "close": close,
+        "ma": np.full(n, np.nan), "upper": np.full(n, np.nan), "lower": np.full(n, np.nan),
+        "pct_b": np.full(n, np.nan), "macd": np.full(n, np.nan), "signal": np.full(n, np.nan),
+        "hist": np.full(n, np.nan), "bars_since_bearish": np.full(n, -1), "valid": complete,
+        "stale": np.isnan(close),
+    }
+    if closes.shape[1] < max(window, slow + signal) or not complete.any():
+        result["valid"] = np.zeros(n, dtype=bool)
+        return result
+    panel = closes[complete]
+    ma, upper, lower = (a[:, -1] for a in bollinger_bands(panel, window, num_std))
+    macd_line, signal_line, hist = macd(panel, fast, slow, signal)
+    _, bearish = crossover_masks(macd_line, signal_line)
+    recent = bearish[:, ::-1][:, :lookback + 1]
+    since = np.where(recent.any(axis=1), recent.argmax(axis=1), -1)
+    width = upper - lower
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct_b = np.where(width > 0, (panel[:, -1] - lower) / width, 0.5)
+    for key, values in (("ma", ma), ("upper", upper), ("lower", lower), ("pct_b", pct_b),
+                        ("macd", macd_line[:, -1]), ("signal", signal_line[:, -1]), ("hist", hist[:, -1]),
+                        ("bars_since_bearish", since)):
+        result[key][complete] = values
+    return result
+
+def rank_candidates(result, min_pct_b=0.8, top=25):
+    # Bear call spread setups: close near or above the upper band and a
+    # bearish MACD crossover inside the lookback that still holds (MACD below
+    # signal), highest %B first, then the most negative histogram
+    candidates = np.flatnonzero(result["valid"] & (result["pct_b"] >= min_pct_b)
+                                & (result["bars_since_bearish"] >= 0) & (result["hist"] < 0))
+    order = np.lexsort((result["hist"][candidates], -result["pct_b"][candidates]))
+    return candidates[order][:top]
+
+def format_table(symbols, names, result, rows, as_of):
+    lines = [f"Bear call spread candidates as of {as_of}",
+             f"{'Symbol':8}{'Name':28}{'Close':>10}{'Upper':>10}{'%B':>7}{'MACD':>9}{'Signal':>9}{'Hist':>9}{'Cross':>7}"]
+    for i in rows:
+        lines.append(f"{symbols[i]:8}{names[i][:27]:28}{result['close'][i]:10.2f}{result['upper'][i]:10.2f}"
+                     f"{result['pct_b'][i]:7.2f}{result['macd'][i]:9.3f}{result['signal'][i]:9.3f}"
+                     f"{result['hist'][i]:9.3f}{result['bars_since_bearish'][i]:6d}d")
+    if not len(rows):
+        lines.append("(none)")
+    stale = np.flatnonzero(result["stale"])
+    if len(stale):
+        lines.append(f"Skipped {len(stale)} stale symbols with no close on {as_of}: "
+                     + ", ".join(symbols[i] for i in stale))
+    return "\n".join(lines)
+
+def write_csv(path, symbols, names, result, rows):
+    import csv
+    fields = ("close", "ma", "upper", "lower", "pct_b", "macd", "signal", "hist", "bars_since_bearish")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(("symbol", "name") + fields)
+        for i in rows:
+            writer.writerow([symbols[i], names[i]] + [result[key][i].item() for key in fields])
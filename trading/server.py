@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import argparse
+import threading
+import socketserver
+from io import BytesIO
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from trading import report
+from trading.batch import parse_position, report_filename, load_symbols
+from trading.cache import cache
+
+# Local report daemon. numpy, matplotlib, reportlab, the chart templates and
+# the loaded price histories stay warm between requests, so an on-demand
+# report only pays for pricing and rendering.
+#
+#   POST /report   JSON trade with the Version 53 input names (as in a
+#                  batch positions file), plus optional chart_format,
+#                  chart_dpi and output: "pdf" (default, returns the bytes)
+#                  or "path" (writes to the output folder, returns JSON)
+#   GET  /health   JSON status
+#
+#   curl -s --data @trade.json localhost:8766/report -o report.pdf
+#   curl -s --unix-socket /tmp/reports.sock --data @trade.json localhost/report -o report.pdf
+
+render_options = ("chart_format", "chart_dpi", "output")
+
+class ReportService:
+    def __init__(self, out_dir="Reports", refresh=cache.ttls["history"]):
+        self.out_dir = out_dir
+        self.refresh = refresh
+        self.histories = {}
+        self.loaded = {}
+        self.data_lock = threading.Lock()
+        # Chart templates are per-process module state, so reports render one at a time
+        self.render_lock = threading.Lock()
+        self.started = time.time()
+        self.reports = 0
+        self.render_time = 0.0
+
+    def histories_for(self, symbols):
+        now = time.time()
+        with self.data_lock:
+            stale = [s for s in symbols if now - self.loaded.get(s, 0) > self.refresh]
+            if stale:
+                self.histories.update(load_symbols(stale))
+                self.loaded.update(dict.fromkeys(stale, now))
+            return {s: self.histories[s] for s in symbols}
+
+    def build(self, body):
+        options = {k: body.pop(k) for k in render_options if k in body}
+        trade = parse_position(body, "Trade")
+        histories = self.histories_for([trade["stock_symbol"], trade["hedge_symbol"]])
+        stock_name, stock_beta, stock_dates, stock_prices = histories[trade["stock_symbol"]]
+        hedge_name, hedge_beta, hedge_dates, hedge_prices = histories[trade["hedge_symbol"]]
+        trade = dict(trade, stock_name=stock_name, stock_beta=stock_beta, hedge_name=hedge_name, hedge_beta=hedge_beta)
+        if options.get("output") == "path":
+            # A client-supplied filename must be a plain name inside out_dir
+            filename = str(report_filename(trade))
+            out_dir = os.path.abspath(self.out_dir)
+            target = os.path.abspath(os.path.join(out_dir, filename))
+            if os.path.basename(filename) != filename or os.path.dirname(target) != out_dir:
+                raise ValueError(f"Invalid report filename {filename!r}")
+            os.makedirs(self.out_dir, exist_ok=True)
+        else:
+            target = BytesIO()
+        with self.render_lock:
+            start = time.perf_counter()
+            report.generate_pdf(trade, stock_dates, stock_prices, hedge_dates, hedge_prices, target, chart_workers=1,
+                                chart_format=options.get("chart_format", "vector"),
+                                chart_dpi=options.get("chart_dpi"))
+            elapsed = time.perf_counter() - start
+            self.reports += 1
+            self.render_time += elapsed
+        return (target if isinstance(target, str) else target.getvalue()), elapsed
+
+    def warm(self, symbols):
+        # Load the histories and render one throwaway report so fonts,
+        # chart templates and lazily imported modules are ready
+        histories = self.histories_for(symbols)
+        stock, hedge = symbols[0], symbols[-1]
+        stock_price, hedge_price = histories[stock][3][-1], histories[hedge][3][-1]
+        as_of = histories[stock][2][-1].astype(object)
+        trade = {"stock_symbol": stock, "hedge_symbol": hedge, "short_call": round(stock_price * 1.05),
+                 "long_call": round(stock_price * 1.05) + 5, "premium": 1.0, "hedge_put_price": round(hedge_price * 0.9),
+                 "expiration": (as_of + timedelta(days=30)).strftime("%d/%m/%y"), "target_price": stock_price}
+        _, elapsed = self.build(trade)
+        with self.render_lock:
+            self.reports -= 1
+            self.render_time -= elapsed
+        return elapsed
+
+    def status(self):
+        return {
+            "uptime": round(time.time() - self.started, 1),
+            "reports": self.reports,
+            "avg_render": round(self.render_time / self.reports, 3) if self.reports else None,
+            "symbols": sorted(self.histories),
+            "cache": cache.summary(),
+        }
+
+class ReportHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.partition("?")[0] == "/health":
+            return self.send_json(self.server.service.status())
+        self.send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        if self.path.partition("?")[0] != "/report":
+            return self.send_json({"error": "not found"}, 404)
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("Trade must be a JSON object")
+            result, elapsed = self.server.service.build(body)
+        except (ValueError, KeyError) as e:
+            return self.send_json({"error": str(e)}, 400)
+        except Exception as e:
+            return self.send_json({"error": f"{type(e).__name__}: {e}"}, 500)
+        if isinstance(result, str):
+            return self.send_json({"path": result, "elapsed": round(elapsed, 3)})
+        self.send(result, "application/pdf", headers={"X-Render-Seconds": f"{elapsed:.3f}"})
+
+    def send_json(self, body, status=200):
+        self.send(json.dumps(body).encode(), "application/json", status)
+
+    def send(self, body, content_type, status=200, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no host/port
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def start(service, host="127.0.0.1", port=8766, socket_path=None):
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, ReportHandler)
+        address = socket_path
+    else:
+        server = ThreadingHTTPServer((host, port), ReportHandler)
+        server.daemon_threads = True
+        address = f"http://{host}:{server.server_address[1]}"
+    server.service = service
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, address
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve bear call spread reports from a warm process")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8766)
+    parser.add_argument("-s", "--socket", default=None, help="listen on a Unix socket instead of TCP")
+    parser.add_argument("-o", "--out", default="Reports", help="output folder for output=path requests")
+    parser.add_argument("--preload", nargs="*", default=["AAPL", "TSLA"], help="symbols to load at startup")
+    args = parser.parse_args()
+    service = ReportService(args.out)
+    if args.preload:
+        try:
+            print(f"Warmed up in {service.warm([s.upper() for s in args.preload]):.2f}s")
+        except (ValueError, IndexError) as e:
+            print(f"Warm-up skipped: {e}")
+    server, address = start(service, args.host, args.port, args.socket)
+    print(f"Serving reports at {address}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
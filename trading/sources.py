@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Pluggable data sources raced against each other. A source is a function
+# fn(key, timeout) returning a result or raising. race() starts the
+# sources in priority order, hedging to the next one every `hedge` seconds
+# (or as soon as one fails), and returns the first valid result; sources
+# that have not started by then never start, and running ones are left to
+# finish against their own timeouts with nobody waiting on them.
+# Fallback sources (local data) only run once every racing source has
+# failed or the deadline has passed, one at a time.
+# Every finished call updates the source's stats, and racing sources are
+# ordered by expected time to a valid result: mean latency over the
+# success rate, so a vendor that is slow or failing drops back on its own.
+hedge_delay = 0.5
+# Latency assumed for a source with no successful calls yet
+default_latency = 1.0
+# Weight of the newest call in the latency average
+decay = 0.2
+
+class Source:
+    def __init__(self, name, fn, priority=0, fallback=False):
+        self.name = name
+        self.fn = fn
+        self.priority = priority
+        self.fallback = fallback
+
+class Registry:
+    def __init__(self, stats_path=None):
+        # stats_path: a file, a function returning one (read at each use, so
+        # it can follow a cache directory that moves) or None to keep stats
+        # in memory only
+        self.sources = {}
+        self.stats = {}
+        self.stats_path = stats_path
+        self.lock = threading.Lock()
+        self._loaded = False
+        self._loaded_from = None
+
+    def register(self, name, fn, priority=0, fallback=False):
+        # Lower priority runs first until stats say otherwise
+        self.sources[name] = Source(name, fn, priority, fallback)
+        return fn
+
+    # --- Stats ---
+    def path(self):
+        return self.stats_path() if callable(self.stats_path) else self.stats_path
+
+    def _load(self):
+        # Stats start over when the path changes
+        path = self.path()
+        if self._loaded and path == self._loaded_from:
+            return
+        self._loaded, self._loaded_from = True, path
+        self.stats = {}
+        if path is None:
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.stats.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        with self.lock:
+            path = self._loaded_from
+            if not self._loaded or path is None:
+                return
+            stats = json.dumps(self.stats, indent=1, sort_keys=True)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(stats)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def record(self, name, seconds, error=None):
+        with self.lock:
+            self._load()
+            s = self.stats.setdefault(name, {"calls": 0, "errors": 0, "latency": None, "last_error": None})
+            s["calls"] += 1
+            if error is None:
+                s["latency"] = seconds if s["latency"] is None else (1 - decay) * s["latency"] + decay * seconds
+            else:
+                s["errors"] += 1
+                s["last_error"] = f"{type(error).__name__}: {error}"[:200]
+
+    def expected(self, name):
+        # Seconds to a valid result: mean latency over the success rate
+        # (smoothed, so one failure does not bury a source for good)
+        s = self.stats.get(name)
+        if s is None:
+            return default_latency
+        latency = default_latency if s["latency"] is None else s["latency"]
+        return latency * (s["calls"] + 2) / (s["calls"] - s["errors"] + 1)
+
+    def ordered(self, names=None):
+        # (racing, fallback) sources in the order they are tried
+        with self.lock:
+            self._load()
+            sources = [s for s in self.sources.values() if names is None or s.name in names]
+            racing = sorted((s for s in sources if not s.fallback), key=lambda s: (self.expected(s.name), s.priority))
+        fallback = sorted((s for s in sources if s.fallback), key=lambda s: s.priority)
+        return racing, fallback
+
+    # --- Racing ---
+    def _call(self, source, key, timeout, valid, abandoned=None):
+        # An invalid result counts against the source like an error. Calls
+        # the race gave up on were already recorded as timeouts.
+        start = time.perf_counter()
+        try:
+            result = source.fn(key, timeout)
+            if not valid(result):
+                raise ValueError("no data")
+        except Exception as e:
+            if abandoned is None or not abandoned.is_set():
+                self.record(source.name, time.perf_counter() - start, e)
+            raise
+        if abandoned is None or not abandoned.is_set():
+            self.record(source.name, time.perf_counter() - start)
+        return result
+
+    def race(self, key, names=None, deadline=10, hedge=hedge_delay, valid=None):
+        # Returns (source name, result) for the first valid result for key.
+        # valid(result) defaults to "not None". Raises LookupError with the
+        # sources' errors if none has one.
+        valid = valid or (lambda result: result is not None)
+        racing, fallback = self.ordered(names)
+        errors = {}
+        end = time.monotonic() + deadline
+        winner = None
+        if deadline <= 0:
+            # Past the deadline only the fallbacks run
+            errors.update((source.name, TimeoutError("deadline passed")) for source in racing)
+            racing = []
+        if racing:
+            executor = ThreadPoolExecutor(max_workers=len(racing))
+            futures, pending = {}, set()
+            queue = list(racing)
+            abandoned = threading.Event()
+            started = time.perf_counter()
+
+            def start():
+                source = queue.pop(0)
+                future = executor.submit(self._call, source, key, max(0.0, end - time.monotonic()), valid, abandoned)
+                futures[future] = source
+                pending.add(future)
+
+            try:
+                start()
+                while pending or queue:
+                    remaining = end - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    if not pending:
+                        start()
+                        continue
+                    done, _ = wait(pending, timeout=min(hedge, remaining) if queue else remaining,
+                                   return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.discard(future)
+                        error = future.exception()
+                        if error is None:
+                            winner = (futures[future].name, future.result())
+                            break
+                        errors[futures[future].name] = error
+                    if winner is not None:
+                        break
+                    if queue:
+                        # A source failed or the running ones are slow: hedge
+                        start()
+                abandoned.set()
+                for future in pending:
+                    if not future.done():
+                        error = TimeoutError(f"no result within {time.perf_counter() - started:.2f}s")
+                        self.record(futures[future].name, time.perf_counter() - started, error)
+                        errors[futures[future].name] = error
+                for source in queue:
+                    errors[source.name] = TimeoutError("not started")
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+        for source in fallback:
+            if winner is not None:
+                break
+            try:
+                winner = (source.name, self._call(source, key, max(0.0, end - time.monotonic()), valid))
+            except Exception as e:
+                errors[source.name] = e
+        self.save()
+        if winner is None:
+            raise LookupError(f"No source for {key}: " + "; ".join(f"{n}: {e}" for n, e in errors.items()))
+        return winner
+
+    def report(self):
+        racing, fallback = self.ordered()
+        lines = [f"{'Source':12}{'Calls':>7}{'Errors':>8}{'Latency':>10}{'Expected':>10}"]
+        for source in racing + fallback:
+            s = self.stats.get(source.name, {"calls": 0, "errors": 0, "latency": None})
+            latency = "-" if s["latency"] is None else f"{s['latency']:.3f}s"
+            expected = "fallback" if source.fallback else f"{self.expected(source.name):.3f}s"
+            lines.append(f"{source.name:12}{s['calls']:7d}{s['errors']:8d}{latency:>10}{expected:>10}")
+        return "\n".join(lines)
@@ -0,0 +1,150 @@
+import csv
+import json
+import numpy as np
+from trading.pricing import black_scholes, norm_cdf, days_per_year
+
+# Strike selection for the bear call spread. A chain is a dict of call
+# quotes for one expiry:
+#   symbol, spot, years (to expiry)
+#   strike, bid, ask (n,) sorted by strike; iv (n,) or None
+# Every (short, long) pair with short < long is evaluated at once on the
+# upper triangle of the strike grid.
+
+# --- Chains ---
+def _chain(symbol, spot, years, rows):
+    rows = sorted(rows, key=lambda r: float(r["strike"]))
+    chain = {"symbol": symbol, "spot": float(spot), "years": float(years)}
+    for key in ("strike", "bid", "ask"):
+        chain[key] = np.array([float(r[key]) for r in rows])
+    ivs = [r.get("iv") for r in rows]
+    chain["iv"] = np.array([float(v) for v in ivs]) if ivs and all(v not in (None, "") for v in ivs) else None
+    return chain
+
+def load_chain(path, symbol=None, spot=None, years=None):
+    # JSON: {"symbol", "spot", "days" or "years", "calls": [{"strike", "bid",
+    # "ask"[, "iv"]}]}. CSV: strike,bid,ask[,iv] columns with spot and years
+    # passed in. Arguments override the file.
+    if path.lower().endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            body = json.load(f)
+        rows = body["calls"]
+        symbol = symbol or body.get("symbol")
+        spot = spot if spot is not None else body["spot"]
+        if years is None:
+            years = body["years"] if "years" in body else body["days"] / days_per_year
+    else:
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        if spot is None or years is None:
+            raise ValueError("A CSV chain needs the spot and time to expiry")
+    return _chain(symbol, spot, years, rows)
+
+def synthetic_chain(symbol, spot, years, vol, rate=0.0, step=None, count=60, skew=-0.1, spread=0.02):
+    # Stand-in chain: Black-Scholes calls on a strike grid around the spot
+    # with a linear skew in log-moneyness and a bid/ask spread of `spread`
+    # of the mid (at least a cent)
+    if step is None:
+        step = max(0.5, round(spot * 0.005 * 2) / 2)
+    centre = round(spot / step) * step
+    strike = centre + step * np.arange(-(count // 4), count - count // 4)
+    strike = strike[strike > 0]
+    iv = np.maximum(vol + skew * np.log(strike / spot), 0.05)
+    mid = black_scholes(1, spot, strike, years, iv, rate)["price"]
+    half = np.maximum(mid * spread / 2, 0.005)
+    return {"symbol": symbol, "spot": float(spot), "years": float(years), "strike": strike,
+            "bid": np.round(np.maximum(mid - half, 0.0), 2), "ask": np.round(mid + half, 2), "iv": iv}
+
+# --- Sweep ---
+def terminal_prices(spot, years, vol, rate=0.0, paths=100_000, seed=None):
+    # Sorted risk-neutral GBM closes at expiry for Monte Carlo POP
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal(paths)
+    out = spot * np.exp((rate - 0.5 * vol * vol) * years + vol * np.sqrt(years) * z)
+    out.sort()
+    return out
+
+def sweep(chain, vol=None, rate=0.0, pop="bs", paths=100_000, seed=None, fill="natural", max_width=None):
+    # Per pair: short/long strikes, credit (per share: bid - ask on the
+    # natural fill, mid - mid otherwise), max loss, breakeven, risk/reward
+    # (credit / max loss, as report.risk_reward) and probability of
+    # expiring below the breakeven. Pairs without a positive credit and
+    # max loss are dropped.
+    # BS POP uses the chain iv interpolated at the breakeven when the chain
+    # has one, else vol; MC POP draws GBM closes at vol.
+    strike, bid, ask = chain["strike"], chain["bid"], chain["ask"]
+    short, long = np.triu_indices(len(strike), 1)
+    if fill == "natural":
+        credit = bid[short] - ask[long]
+    else:
+        credit = (bid[short] + ask[short] - bid[long] - ask[long]) / 2
+    width = strike[long] - strike[short]
+    max_loss = width - credit
+    keep = (credit > 0) & (max_loss > 0) & (bid[short] > 0)
+    if max_width is not None:
+        keep &= width <= max_width
+    short, long, credit, width, max_loss = short[keep], long[keep], credit[keep], width[keep], max_loss[keep]
+    breakeven = strike[short] + credit
+    spot, years = chain["spot"], chain["years"]
+    if vol is None:
+        if chain["iv"] is None:
+            raise ValueError("No volatility given and the chain has no implied vols")
+        vol = float(np.interp(spot, strike, chain["iv"]))
+    if pop == "mc":
+        closes = terminal_prices(spot, years, vol, rate, paths, seed)
+        prob = np.searchsorted(closes, breakeven) / len(closes)
+    elif years > 0:
+        v = np.interp(breakeven, strike, chain["iv"]) if chain["iv"] is not None else vol
+        d2 = (np.log(spot / breakeven) + (rate - 0.5 * v * v) * years) / (v * np.sqrt(years))
+        prob = norm_cdf(-d2)
+    else:
+        prob = (spot < breakeven).astype(np.float64)
+    return {
+        "short_call": strike[short], "long_call": strike[long], "credit": credit, "width": width,
+        "max_loss": max_loss, "breakeven": breakeven, "risk_reward": credit / max_loss, "pop": prob,
+    }
+
+pareto_block = 512
+
+def pareto(candidates, objectives=("risk_reward", "pop")):
+    # Indices of the candidates no other candidate beats on every objective
+    # (all maximised; negate a column to minimise it), best first objective
+    # first
+    values = np.column_stack([candidates[key] for key in objectives])
+    if not len(values):
+        return np.array([], dtype=np.intp)
+    order = np.lexsort(values[:, ::-1].T * -1)
+    values = values[order]
+    if values.shape[1] == 2:
+        # Sorted by the first objective (ties by the second), a candidate is
+        # efficient iff its second objective beats every earlier one
+        best = np.maximum.accumulate(values[:, 1])
+        front = np.ones(len(values), dtype=bool)
+        front[1:] = values[1:, 1] > best[:-1]
+        return order[front]
+    # Otherwise compare in blocks (quadratic in the front size) against the front so far and the earlier
+    # rows of the block; a row can only be dominated by an earlier one
+    front = np.empty((0, values.shape[1]))
+    keep = []
+    for start in range(0, len(values), pareto_block):
+        block = values[start:start + pareto_block]
+        beaten = (front[:, None, :] >= block[None, :, :]).all(axis=-1).any(axis=0)
+        within = (block[:, None, :] >= block[None, :, :]).all(axis=-1)
+        beaten |= np.triu(within, 1).any(axis=0)
+        keep.append(start + np.flatnonzero(~beaten))
+        front = values[np.concatenate(keep)]
+    return order[np.concatenate(keep)]
+
+def optimize(chain, vol=None, rate=0.0, pop="bs", objectives=("risk_reward", "pop"), **kw):
+    candidates = sweep(chain, vol, rate, pop, **kw)
+    front = pareto(candidates, objectives)
+    return {key: values[front] for key, values in candidates.items()}, len(candidates["credit"])
+
+def format_table(chain, front, evaluated, top=None):
+    lines = [f"{chain['symbol'] or ''} spot {chain['spot']:.2f}, {chain['years'] * days_per_year:.0f} days: "
+             f"{len(front['credit'])} efficient of {evaluated} strike pairs",
+             f"{'Short':>8}{'Long':>8}{'Credit':>8}{'Max loss':>10}{'Breakeven':>11}{'R/R':>7}{'POP':>7}"]
+    for i in range(len(front["credit"]))[:top]:
+        lines.append(f"{front['short_call'][i]:8.2f}{front['long_call'][i]:8.2f}{front['credit'][i]:8.2f}"
+                     f"{front['max_loss'][i]:10.2f}{front['breakeven'][i]:11.2f}{front['risk_reward'][i]:7.2f}"
+                     f"{front['pop'][i]:7.1%}")
+    return "\n".join(lines)
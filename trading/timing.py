@@ -0,0 +1,202 @@
+import os
+import sys
+import json
+import time
+import platform
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+# Stage timing for reports. stage(name) / @timed(name) record wall time
+# while a Session is active and do nothing otherwise.
+# Stages nest per thread ("generate_pdf/charts"). Charts rendered in worker
+# processes are timed there and added with record(). A Session can also
+# run cProfile (calling thread only) and tracemalloc, which adds the peak
+# traced memory of each stage.
+_active = None
+_local = threading.local()
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+class Session:
+    def __init__(self, profile=False, memory=False, label=None, top=25):
+        self.profile = profile
+        self.memory = memory
+        self.label = label
+        self.top = top
+        self.records = []
+        self.lock = threading.Lock()
+        self.profiler = None
+        self.started = None
+        self.wall = None
+        self.snapshot = None
+
+    def start(self):
+        global _active
+        if self.memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        if self.profile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.started = time.perf_counter()
+        _active = self
+        return self
+
+    def stop(self):
+        global _active
+        self.wall = time.perf_counter() - self.started
+        _active = None
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.memory:
+            import tracemalloc
+            self.snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def add(self, name, seconds, peak=None, allocated=None):
+        record = {"stage": name, "seconds": round(seconds, 6)}
+        if peak is not None:
+            record.update(peak_kb=round(peak / 1024, 1), allocated_kb=round(allocated / 1024, 1))
+        with self.lock:
+            self.records.append(record)
+
+    def stages(self):
+        # Per stage: calls, total/mean/max seconds and the largest peak
+        totals = {}
+        for r in self.records:
+            t = totals.setdefault(r["stage"], {"stage": r["stage"], "calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+            t["calls"] += 1
+            t["seconds"] += r["seconds"]
+            t["max_seconds"] = max(t["max_seconds"], r["seconds"])
+            if "peak_kb" in r:
+                t["peak_kb"] = max(t.get("peak_kb", 0.0), r["peak_kb"])
+        out = sorted(totals.values(), key=lambda t: t["stage"])
+        for t in out:
+            t["mean_seconds"] = round(t["seconds"] / t["calls"], 6)
+            t["seconds"] = round(t["seconds"], 6)
+        return out
+
+    def _profile_rows(self):
+        import pstats
+        stats = pstats.Stats(self.profiler).sort_stats("cumulative")
+        rows = []
+        for func in stats.fcn_list[:self.top]:
+            calls, primitive, tottime, cumtime, _ = stats.stats[func]
+            filename, line, name = func
+            rows.append({"function": f"{os.path.basename(filename)}:{line}({name})", "calls": calls,
+                         "tottime": round(tottime, 6), "cumtime": round(cumtime, 6)})
+        return rows
+
+    def _memory_rows(self):
+        rows = []
+        for stat in self.snapshot.statistics("lineno")[:self.top]:
+            frame = stat.traceback[0]
+            rows.append({"line": f"{frame.filename}:{frame.lineno}", "size_kb": round(stat.size / 1024, 1),
+                         "count": stat.count})
+        return rows
+
+    def report(self):
+        out = {
+            "label": self.label,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "wall_seconds": round(self.wall if self.wall is not None else time.perf_counter() - self.started, 6),
+            "stages": self.stages(),
+            "events": self.records,
+        }
+        try:
+            import resource
+            # kB on Linux, bytes on macOS
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            out["max_rss_kb"] = rss / 1024 if sys.platform == "darwin" else rss
+        except ImportError:
+            pass
+        if self.profiler is not None:
+            out["profile"] = self._profile_rows()
+        if self.snapshot is not None:
+            out["memory"] = self._memory_rows()
+        return out
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=1)
+        if self.profiler is not None:
+            self.profiler.dump_stats(os.path.splitext(path)[0] + ".prof")
+        return path
+
+def report_path(pdf_file):
+    # "Report.pdf" -> "Report timings.json"
+    return os.path.splitext(pdf_file)[0] + " timings.json"
+
+@contextmanager
+def stage(name):
+    session = _active
+    if session is None:
+        yield
+        return
+    stack = _stack()
+    tracing = None
+    if session.memory:
+        import tracemalloc
+        tracing = tracemalloc.is_tracing()
+    if tracing:
+        # The peak counter is shared, so each stage folds its peak into its
+        # parent's before resetting it
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+    frame = [name, 0, current if tracing else 0]
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        path = "/".join(f[0] for f in stack)
+        stack.pop()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(frame[1], peak)
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            session.add(path, elapsed, peak, current - frame[2])
+        else:
+            session.add(path, elapsed)
+
+def timed(name=None):
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return fn(*args, **kwargs)
+            with stage(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def record(name, seconds):
+    # Add a stage timed elsewhere, e.g. in a worker process, under the
+    # current stage
+    session = _active
+    if session is not None:
+        session.add("/".join([f[0] for f in _stack()] + [name]), seconds)
@@ -0,0 +1,148 @@
+import numpy as np
+from matplotlib.backend_bases import RendererBase
+from matplotlib.font_manager import weight_dict
+from matplotlib.path import Path as MplPath
+from reportlab.graphics.shapes import Drawing, Group, Path, String
+from reportlab.lib.colors import Color
+from reportlab.pdfbase.pdfmetrics import stringWidth, getAscentDescent
+
+# Draws a matplotlib figure into a reportlab Drawing so charts land in the
+# PDF as vector paths and text instead of PNGs. The figure is laid out at
+# 72 dpi so display units are PDF points, and text uses the standard PDF
+# fonts so nothing needs embedding. Images (imshow etc.) are not supported.
+
+caps = {"butt": 0, "round": 1, "projecting": 2}
+joins = {"miter": 0, "round": 1, "bevel": 2}
+fonts = {
+    "sans-serif": ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique"),
+    "serif": ("Times-Roman", "Times-Bold", "Times-Italic", "Times-BoldItalic"),
+    "monospace": ("Courier", "Courier-Bold", "Courier-Oblique", "Courier-BoldOblique"),
+}
+
+def font_name(prop):
+    family = prop.get_family()[0]
+    names = fonts.get(family, fonts["sans-serif"])
+    weight = prop.get_weight()
+    bold = (weight_dict.get(weight, 400) if isinstance(weight, str) else weight) >= 600
+    italic = prop.get_style() in ("italic", "oblique")
+    return names[bold + 2 * italic]
+
+def pdf_text(s):
+    # The standard fonts have no unicode minus
+    return s.replace("\u2212", "-")
+
+def to_path(path, transform, clip=None, simplify=None, **style):
+    shape = Path(autoclose="svg", **style)
+    last = (0.0, 0.0)
+    for points, code in path.iter_segments(transform, clip=clip, simplify=simplify, curves=True):
+        if code == MplPath.MOVETO:
+            shape.moveTo(*points)
+        elif code == MplPath.LINETO:
+            shape.lineTo(*points)
+        elif code == MplPath.CURVE3:
+            (qx, qy), (x, y) = points[:2], points[2:]
+            shape.curveTo(last[0] + 2 / 3 * (qx - last[0]), last[1] + 2 / 3 * (qy - last[1]),
+                          x + 2 / 3 * (qx - x), y + 2 / 3 * (qy - y), x, y)
+        elif code == MplPath.CURVE4:
+            shape.curveTo(*points)
+        elif code == MplPath.CLOSEPOLY:
+            shape.closePath()
+        if code != MplPath.CLOSEPOLY:
+            last = tuple(points[-2:])
+    return shape
+
+def clip_rect(x, y, width, height):
+    return Path([x, y, x + width, y, x + width, y + height, x, y + height], [0, 1, 1, 1, 3],
+                isClipPath=1, strokeColor=None, fillColor=None)
+
+class DrawingRenderer(RendererBase):
+    def __init__(self, width, height):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.root = Group()
+        self._clip = None
+        self._group = self.root
+
+    def flipy(self):
+        return False
+
+    def get_canvas_width_height(self):
+        return self.width, self.height
+
+    def points_to_pixels(self, points):
+        return points
+
+    def _add(self, gc, node):
+        # Consecutive nodes with the same clip share one clipped group
+        rect = gc.get_clip_rectangle()
+        tpath, affine = gc.get_clip_path()
+        key = (tuple(rect.bounds) if rect is not None else None,
+               (id(tpath), tuple(affine.to_values())) if tpath is not None else None)
+        if key != self._clip:
+            self._clip = key
+            self._group = Group()
+            self.root.add(self._group)
+            if rect is not None:
+                self._group.add(clip_rect(*rect.bounds))
+            if tpath is not None:
+                self._group.add(to_path(tpath, affine, isClipPath=1, strokeColor=None, fillColor=None))
+        self._group.add(node)
+
+    def draw_path(self, gc, path, transform, rgbFace=None):
+        r, g, b, a = gc.get_rgb()
+        width = gc.get_linewidth()
+        style = {"strokeColor": None, "fillColor": None}
+        if width > 0 and a > 0:
+            style.update(strokeColor=Color(r, g, b), strokeOpacity=a, strokeWidth=width,
+                         strokeLineCap=caps[gc.get_capstyle()], strokeLineJoin=joins[gc.get_joinstyle()])
+            offset, dashes = gc.get_dashes()
+            if dashes is not None and len(dashes):
+                style["strokeDashArray"] = (offset, [float(d) for d in dashes])
+        if rgbFace is not None:
+            fill_alpha = gc.get_alpha() if gc.get_forced_alpha() or len(rgbFace) < 4 else rgbFace[3]
+            if fill_alpha > 0:
+                style.update(fillColor=Color(*rgbFace[:3]), fillOpacity=fill_alpha)
+        if style["strokeColor"] is None and style["fillColor"] is None:
+            return
+        # Like the PDF backend: simplify and clip unfilled lines to the page
+        unfilled = rgbFace is None and gc.get_hatch() is None
+        clip = (0.0, 0.0, self.width, self.height) if unfilled else None
+        self._add(gc, to_path(path, transform, clip, path.should_simplify and unfilled, **style))
+
+    def draw_text(self, gc, x, y, s, prop, angle, ismath=False, mtext=None):
+        if ismath:
+            return super().draw_text(gc, x, y, s, prop, angle, ismath, mtext)
+        r, g, b, a = gc.get_rgb()
+        text = String(0, 0, pdf_text(s), fontName=font_name(prop), fontSize=prop.get_size_in_points(),
+                      fillColor=Color(r, g, b), fillOpacity=a)
+        theta = np.deg2rad(angle)
+        cos, sin = np.cos(theta), np.sin(theta)
+        self._add(gc, Group(text, transform=(cos, sin, -sin, cos, x, y)))
+
+    def get_text_width_height_descent(self, s, prop, ismath):
+        if ismath:
+            return super().get_text_width_height_descent(s, prop, ismath)
+        name, size = font_name(prop), prop.get_size_in_points()
+        ascent, descent = getAscentDescent(name, size)
+        return stringWidth(pdf_text(s), name, size), ascent - descent, -descent
+
+def figure_drawing(fig, tight=False, pad_inches=0.1):
+    # tight crops to the artists' extent like savefig(bbox_inches="tight")
+    dpi = fig.dpi
+    fig.dpi = 72
+    try:
+        width, height = fig.get_size_inches() * 72
+        renderer = DrawingRenderer(width, height)
+        x0 = y0 = 0.0
+        if tight:
+            bbox = fig.get_tightbbox(renderer).padded(pad_inches)
+            x0, y0, width, height = (v * 72 for v in bbox.bounds)
+        fig.draw(renderer)
+    finally:
+        fig.dpi = dpi
+    # Crop to the figure (or tight box) like the PNG canvas would
+    renderer.root.transform = (1, 0, 0, 1, -x0, -y0)
+    drawing = Drawing(width, height)
+    drawing.add(Group(clip_rect(0, 0, width, height), renderer.root))
+    return drawing
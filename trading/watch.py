@@ -0,0 +1,257 @@
+import os
+import time
+import argparse
+import tempfile
+from datetime import datetime
+import numpy as np
+from trading import report
+from trading import price_store
+from trading.cache import cache
+from trading.data import load_many
+from trading.indicators import bollinger_bands, macd, BollingerBands, MACD
+from trading.batch import read_positions, report_filename
+
+# Watch mode: poll the loaders for new closes, extend each symbol's
+# indicators one bar at a time and re-render only the charts whose inputs
+# changed (P&L, Bollinger and MACD follow the stock, the hedge chart the
+# hedge). A changed close for the latest date, e.g. an intraday bar,
+# revises the last value instead of appending one.
+
+# --- Incremental state ---
+class Series:
+    # Append-only buffer with amortised O(1) growth
+    def __init__(self, values, dtype=np.float64):
+        values = np.asarray(values, dtype=dtype)
+        self.size = len(values)
+        self.data = np.empty(max(16, 2 * self.size), dtype=dtype)
+        self.data[:self.size] = values
+
+    def append(self, value):
+        if self.size == len(self.data):
+            self.data = np.concatenate((self.data, np.empty_like(self.data)))
+        self.data[self.size] = value
+        self.size += 1
+
+    def set_last(self, value):
+        self.data[self.size - 1] = value
+
+    @property
+    def values(self):
+        return self.data[:self.size]
+
+class Bands:
+    # Bollinger series extended by the incremental indicator
+    def __init__(self, prices, window, num_std):
+        self.ma, self.upper, self.lower = (Series(a) for a in bollinger_bands(prices, window, num_std))
+        self.state = BollingerBands.from_history(prices, window, num_std)
+
+    def update(self, price, revise=False):
+        value = self.state.revise(price) if revise else self.state.update(price)
+        if value is None:
+            return
+        for series, v in zip((self.ma, self.upper, self.lower), value):
+            if revise:
+                series.set_last(v)
+            else:
+                series.append(v)
+
+    def series(self):
+        return self.ma.values, self.upper.values, self.lower.values
+
+class Macd:
+    def __init__(self, prices, fast, slow, signal):
+        line, signal_line, _ = macd(prices, fast, slow, signal)
+        self.macd, self.signal = Series(line), Series(signal_line)
+        self.state = MACD.from_history(prices, fast, slow, signal)
+
+    def update(self, price, revise=False):
+        line, signal, _ = self.state.revise(price) if revise else self.state.update(price)
+        if revise:
+            self.macd.set_last(line)
+            self.signal.set_last(signal)
+        else:
+            self.macd.append(line)
+            self.signal.append(signal)
+
+    def series(self):
+        return self.macd.values, self.signal.values
+
+class SymbolState:
+    def __init__(self, name, beta, dates, prices):
+        self.name = name
+        self.beta = beta
+        self.dates = Series(dates, "datetime64[D]")
+        self.prices = Series(prices)
+        self.bands = {}
+        self.macds = {}
+        # Bumped whenever a close is added or revised
+        self.version = 0
+
+    def bollinger(self, window, num_std):
+        key = (window, num_std)
+        if key not in self.bands:
+            self.bands[key] = Bands(self.prices.values, window, num_std)
+        return self.bands[key]
+
+    def macd(self, fast, slow, signal):
+        key = (fast, slow, signal)
+        if key not in self.macds:
+            self.macds[key] = Macd(self.prices.values, fast, slow, signal)
+        return self.macds[key]
+
+    def extend(self, dates, prices):
+        # Apply the bars from the last known date on; returns how many changed
+        changed = 0
+        start = 0
+        if self.dates.size:
+            start = int(np.searchsorted(dates, self.dates.values[-1]))
+        indicators = list(self.bands.values()) + list(self.macds.values())
+        for date, price in zip(dates[start:], prices[start:]):
+            price = float(price)
+            revise = self.dates.size > 0 and date == self.dates.values[-1]
+            if revise:
+                if price == self.prices.values[-1]:
+                    continue
+                self.prices.set_last(price)
+            else:
+                self.dates.append(date)
+                self.prices.append(price)
+            for indicator in indicators:
+                indicator.update(price, revise)
+            changed += 1
+        if changed:
+            self.version += 1
+        return changed
+
+# --- Watch ---
+class Watch:
+    def __init__(self, positions, out_dir, chart_format="vector", chart_dpi=None):
+        self.positions = [dict(report.trade_defaults, **p) for p in positions]
+        self.symbols = sorted({p["stock_symbol"] for p in positions} | {p["hedge_symbol"] for p in positions})
+        self.out_dir = out_dir
+        self.chart_format = chart_format
+        self.chart_dpi = chart_dpi
+        self.states = {}
+        # position index -> ((stock version, hedge version), rendered charts,
+        # (simulation inputs, simulation summary))
+        self.rendered = {}
+
+    def poll(self):
+        # One concurrent round of incremental history requests; returns the
+        # symbols with new or revised closes
+        first = not self.states
+        loaded = load_many(self.symbols, betas=first, use_cache=first)
+        updated = []
+        for symbol, (name, _, dates, prices, beta) in loaded.items():
+            state = self.states.get(symbol)
+            if state is None:
+                self.states[symbol] = SymbolState(name, beta, dates, prices)
+                updated.append(symbol)
+            elif state.extend(dates, prices):
+                updated.append(symbol)
+        return updated
+
+    def refresh(self, n):
+        # Rewrite position n's report if its inputs changed; returns the
+        # filename and the charts re-rendered, or None
+        trade = self.positions[n]
+        stock, hedge = self.states[trade["stock_symbol"]], self.states[trade["hedge_symbol"]]
+        versions = (stock.version, hedge.version)
+        previous = self.rendered.get(n)
+        if previous is not None and previous[0] == versions:
+            return None
+        if previous is None:
+            names = report.chart_names
+        else:
+            names = []
+            if previous[0][0] != stock.version:
+                names += ["pl", "bollinger", "macd"]
+            if previous[0][1] != hedge.version:
+                names.append("hedge")
+        trade = dict(trade, stock_name=stock.name, stock_beta=stock.beta, hedge_name=hedge.name, hedge_beta=hedge.beta)
+        stock_dates, stock_prices = stock.dates.values, stock.prices.values
+        hedge_dates, hedge_prices = hedge.dates.values, hedge.prices.values
+        window, width = trade["bollinger_window"], trade["bollinger_width"]
+        indicators = {
+            "stock_bands": stock.bollinger(window, width).series(),
+            "hedge_bands": hedge.bollinger(window, width).series(),
+            "macd": stock.macd(trade["macd_fast"], trade["macd_slow"], trade["macd_signal"]).series(),
+        }
+        priced = report.price_trade(trade, stock_dates, stock_prices, hedge_dates, hedge_prices)
+        # The Monte Carlo summary is the slow part of a refresh: it only
+        # re-runs when the spots, vols or days to expiry move
+        inputs = (stock_prices[-1] if len(stock_prices) else None, hedge_prices[-1] if len(hedge_prices) else None,
+                  priced.get("volatility"), priced.get("hedge_volatility"), priced.get("days_to_expiry"))
+        if previous is not None and previous[2][0] == inputs:
+            sim = previous[2][1]
+        else:
+            sim = report.simulate_report(priced, stock_dates, stock_prices, hedge_dates, hedge_prices)
+        charts = dict(previous[1]) if previous is not None else {}
+        charts.update(report.render_report_charts(priced, stock_dates, stock_prices, hedge_dates, hedge_prices, names,
+                                                  1, self.chart_format, self.chart_dpi, indicators))
+        filename = os.path.join(self.out_dir, report_filename(trade))
+        report.generate_pdf(trade, stock_dates, stock_prices, hedge_dates, hedge_prices, filename, 1,
+                            self.chart_format, self.chart_dpi, charts=charts, priced=priced, sim=sim)
+        self.rendered[n] = (versions, charts, (inputs, sim))
+        return filename, names
+
+    def refresh_all(self):
+        refreshed = []
+        for n, trade in enumerate(self.positions):
+            try:
+                result = self.refresh(n)
+            except Exception as e:
+                print(f"{trade['stock_symbol']} report failed: {e}")
+                continue
+            if result is not None:
+                refreshed.append(result)
+        return refreshed
+
+def run(positions, out_dir, interval=60.0, ticks=None, chart_format="vector", chart_dpi=None, before_poll=None):
+    # before_poll(tick) runs ahead of each poll, e.g. to publish feed bars
+    os.makedirs(out_dir, exist_ok=True)
+    watch = Watch(positions, out_dir, chart_format, chart_dpi)
+    tick = 0
+    while ticks is None or tick < ticks:
+        started = time.perf_counter()
+        if before_poll is not None:
+            before_poll(tick)
+        updated = watch.poll()
+        refreshed = watch.refresh_all()
+        elapsed = time.perf_counter() - started
+        charts = sum(len(names) for _, names in refreshed)
+        print(f"[{datetime.now():%H:%M:%S}] {len(updated)} symbols updated, {len(refreshed)} reports "
+              f"and {charts} charts re-rendered in {elapsed:.2f}s")
+        tick += 1
+        if ticks is None or tick < ticks:
+            time.sleep(max(0.0, interval - elapsed))
+    return watch
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep bear call spread reports current as new closes arrive")
+    parser.add_argument("positions", help="CSV or JSON list of positions")
+    parser.add_argument("-o", "--out", default="Reports", help="output folder")
+    parser.add_argument("-i", "--interval", type=float, default=60.0, help="seconds between polls")
+    parser.add_argument("-n", "--ticks", type=int, default=None, help="stop after this many polls")
+    parser.add_argument("--charts", choices=("vector", "png"), default="vector", help="chart embedding")
+    parser.add_argument("--dpi", type=int, default=None, help="PNG chart resolution")
+    parser.add_argument("--feed", type=int, default=None, metavar="BARS",
+                        help="replay the last BARS Sim Data closes from the local feed stand-in, one per poll")
+    args = parser.parse_args()
+    before_poll = None
+    if args.feed:
+        from trading import fake_feed
+        # Keep the replayed bars out of the real price store and cache
+        price_store.store_dir = tempfile.mkdtemp(prefix="watch-store-")
+        cache.root = tempfile.mkdtemp(prefix="watch-cache-")
+        server, base_url = fake_feed.start()
+        pending = fake_feed.hold_back(server.feed, args.feed)
+        fake_feed.use_feed(base_url)
+
+        def before_poll(tick):
+            if tick:
+                fake_feed.release(server, pending)
+    try:
+        run(read_positions(args.positions), args.out, args.interval, args.ticks, args.charts, args.dpi, before_poll)
+    except KeyboardInterrupt:
+        pass